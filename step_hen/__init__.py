@@ -16,3 +16,7 @@ from step_hen.presentation import MonoidPresentation, InverseMonoidPresentation
 from step_hen.wordgraph import WordGraph
 from step_hen.schutzenbergergraph import SchutzenbergerGraph
 from step_hen.stephen import Stephen
+from step_hen.simplify import SimplifiedPresentation
+from step_hen.registry import SchutzenbergerGraphRegistry
+from step_hen.toddcoxeter import ToddCoxeter
+from step_hen.sharedwordgraph import SharedWordGraph
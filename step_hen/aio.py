@@ -0,0 +1,212 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2021, J. D. Mitchell + Maria Tsalakou
+#
+# Distributed under the terms of the GPL license version 3.
+#
+# The full license is in the file LICENSE, distributed with this software.
+
+"""
+This module contains the functionality used to run the (possibly
+non-terminating) methods of :py:class:`step_hen.wordgraph.WordGraph`,
+:py:class:`step_hen.schutzenbergergraph.SchutzenbergerGraph`, and
+:py:class:`step_hen.Stephen` from ``asyncio`` code. Every query is run in its
+own process, so that it can be cancelled, or abandoned when its deadline
+passes, by terminating that process.
+
+Every query starts a fresh process, to which the object being queried is
+pickled, so the cost of a query includes pickling the object and starting a
+process. Any work done by the copy in that process, such as running a word
+graph, is discarded when the query returns, and the original object is not
+modified.
+"""
+
+import asyncio
+import multiprocessing
+import multiprocessing.connection
+import weakref
+from typing import Any, Optional
+
+
+def _running_loop():
+    # asyncio.get_running_loop was added in Python 3.7, and inside a coroutine
+    # get_event_loop returns the same loop.
+    if hasattr(asyncio, "get_running_loop"):
+        return asyncio.get_running_loop()
+    return asyncio.get_event_loop()
+
+
+def _worker(conn, obj, method: str, args) -> None:
+    try:
+        result = (True, getattr(obj, method)(*args))
+    except Exception as e:  # pylint: disable=broad-except
+        result = (False, e)
+    conn.send(result)
+    conn.close()
+
+
+class ProcessJob:
+    """
+    Calls the method named ``method`` of a copy of ``obj`` in a separate
+    process.
+    """
+
+    def __init__(self, obj: Any, method: str, *args):
+        """
+        Construct and start the job.
+
+        :param obj: the object whose method is called.
+        :param method: the name of the method.
+        :param args: the arguments of the method.
+        """
+        self._conn, child = multiprocessing.Pipe(duplex=False)
+        self._process = multiprocessing.Process(
+            target=_worker, args=(child, obj, method, args), daemon=True
+        )
+        self._process.start()
+        child.close()
+        self._result = None
+
+    def done(self) -> bool:
+        """
+        Returns ``True`` if the job has finished and ``False`` if not.
+        """
+        if self._result is None and self._conn.poll():
+            try:
+                self._result = self._conn.recv()
+            except EOFError:
+                self._result = (
+                    False,
+                    RuntimeError("the process exited without a result"),
+                )
+            self._process.join()
+        return self._result is not None
+
+    def connection(self):
+        """
+        Returns the connection from which the result of the job is read, for
+        use with :py:func:`multiprocessing.connection.wait`.
+        """
+        return self._conn
+
+    def result(self) -> Any:
+        """
+        Returns the value returned by the method, or raises the exception that
+        it raised. The job must be finished.
+        """
+        assert self.done()
+        success, value = self._result
+        if not success:
+            raise value
+        return value
+
+    def terminate(self) -> None:
+        """
+        Terminates the process running the job if it has not finished.
+        """
+        if self._process.is_alive():
+            self._process.terminate()
+            self._process.join()
+        self._conn.close()
+
+
+class QueryPool:  # pylint: disable=too-few-public-methods
+    """
+    Limits the number of processes used concurrently by the ``async`` methods
+    which are given this as their ``pool`` argument.
+
+    A pool can be used from more than one event loop, the limit applies to
+    each event loop separately.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None):
+        """
+        Construct a pool.
+
+        :param max_workers:
+          the maximum number of queries running at any time, if ``None``, the
+          number of CPUs is used (default: ``None``).
+        """
+        self.max_workers = max_workers or multiprocessing.cpu_count()
+        self._semaphores = weakref.WeakKeyDictionary()
+
+    async def run(
+        self, obj: Any, method: str, *args, timeout: Optional[float] = None
+    ) -> Any:
+        """
+        Runs the method named ``method`` of ``obj`` with arguments ``args``,
+        as in :py:func:`run_in_process`, once a worker is available. The
+        timeout does not include the time spent waiting for a worker.
+        """
+        loop = _running_loop()
+        if loop not in self._semaphores:
+            self._semaphores[loop] = asyncio.Semaphore(self.max_workers)
+        async with self._semaphores[loop]:
+            return await run_in_process(obj, method, *args, timeout=timeout)
+
+
+async def _wait(conn, timeout: Optional[float]) -> None:
+    # Waits until conn is readable or timeout seconds have passed
+    loop = _running_loop()
+    ready = loop.create_future()
+
+    def _on_ready():
+        if not ready.done():
+            ready.set_result(None)
+
+    try:
+        loop.add_reader(conn.fileno(), _on_ready)
+    except NotImplementedError:
+        # For example, the proactor event loop on Windows
+        await loop.run_in_executor(
+            None, multiprocessing.connection.wait, [conn], timeout
+        )
+        return
+    try:
+        await asyncio.wait_for(ready, timeout)
+    except asyncio.TimeoutError:
+        pass
+    finally:
+        loop.remove_reader(conn.fileno())
+
+
+async def run_in_process(
+    obj: Any,
+    method: str,
+    *args,
+    timeout: Optional[float] = None,
+    pool: Optional[QueryPool] = None,
+) -> Any:
+    """
+    Runs the method named ``method`` of (a copy of) ``obj`` with arguments
+    ``args`` in a separate process without blocking the event loop.
+
+    A new process is started for every call, and ``obj`` is pickled to it.
+    The copy of ``obj`` is discarded when the process exits, so any work it
+    did is not available to later calls.
+
+    If the task awaiting this is cancelled, then the process is terminated.
+
+    :param obj: the object whose method is called, it must be picklable.
+    :param method: the name of the method.
+    :param args: the arguments of the method.
+    :param timeout:
+      the number of seconds after which the process is terminated, if
+      ``None``, there is no deadline (default: ``None``).
+    :param pool:
+      the :py:class:`QueryPool` used to limit the number of concurrent
+      processes, if ``None``, there is no limit (default: ``None``).
+    :returns:
+      the value returned by the method, or ``None`` if the deadline passed
+      before it returned.
+    """
+    if pool is not None:
+        return await pool.run(obj, method, *args, timeout=timeout)
+    job = ProcessJob(obj, method, *args)
+    try:
+        await _wait(job.connection(), timeout)
+        if not job.done():
+            return None
+        return job.result()
+    finally:
+        job.terminate()
@@ -0,0 +1,120 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2021, J. D. Mitchell + Maria Tsalakou
+#
+# Distributed under the terms of the GPL license version 3.
+#
+# The full license is in the file LICENSE, distributed with this software.
+
+"""
+This module contains functions for finding the permutations of the generators
+of an inverse monoid presentation which preserve its set of relations. Every
+such permutation induces an automorphism of the inverse monoid defined by the
+presentation, and maps the Schutzenberger graph of a word ``w`` to that of the
+image of ``w``, see :py:class:`step_hen.stephen.Stephen`.
+
+A permutation of the generators is given as a list whose ``i``-th entry is the
+image of the ``i``-th generator.
+"""
+
+from itertools import permutations
+from typing import List, Set, Tuple
+
+from step_hen.presentation import InverseMonoidPresentation
+
+
+def extend(presn: InverseMonoidPresentation, perm: List[int]) -> List[int]:
+    """
+    Returns the permutation of the whole alphabet of ``presn`` induced by the
+    permutation ``perm`` of its generators, that maps the inverse of every
+    generator to the inverse of its image.
+
+    :param presn: the inverse monoid presentation.
+    :param perm: the permutation of the generators.
+    :returns: A ``list`` of ``int``.
+    """
+    return list(perm) + [presn.inverse(x) for x in perm]
+
+
+def _relations(
+    presn: InverseMonoidPresentation, perm: List[int]
+) -> Set[Tuple[Tuple[int], Tuple[int]]]:
+    # Returns the set of the images of the relations of <presn> under <perm>
+    # (extended to the whole alphabet), ignoring the order of the sides of the
+    # relations.
+    perm = extend(presn, perm)
+    result = set()
+    for word1, word2 in presn.relations:
+        word1 = tuple(perm[x] for x in word1)
+        word2 = tuple(perm[x] for x in word2)
+        result.add((word1, word2) if word1 <= word2 else (word2, word1))
+    return result
+
+
+def is_automorphism(presn: InverseMonoidPresentation, perm: List[int]) -> bool:
+    """
+    Returns ``True`` if the permutation ``perm`` of the generators of
+    ``presn`` maps the set of relations of ``presn`` to itself, and ``False``
+    if it does not.
+
+    :param presn: the inverse monoid presentation.
+    :param perm: the permutation of the generators.
+    :returns: A ``bool``.
+    """
+    num_gens = len(presn.alphabet) // 2
+    if sorted(perm) != list(range(num_gens)):
+        return False
+    return _relations(presn, perm) == _relations(presn, range(num_gens))
+
+
+def closure(perms: List[List[int]]) -> List[List[int]]:
+    """
+    Returns the group generated by the permutations ``perms`` of the
+    generators (which must all have the same length).
+
+    :param perms: the permutations.
+    :returns: A ``list`` of ``list`` of ``int``, whose first entry is the
+      identity.
+    """
+    if len(perms) == 0:
+        return []
+    identity = tuple(range(len(perms[0])))
+    result = [identity]
+    seen = {identity}
+    i = 0
+    while i < len(result):
+        for perm in perms:
+            product = tuple(perm[x] for x in result[i])
+            if product not in seen:
+                seen.add(product)
+                result.append(product)
+        i += 1
+    return [list(perm) for perm in result]
+
+
+def automorphisms(
+    presn: InverseMonoidPresentation, limit: int = 5040
+) -> List[List[int]]:
+    """
+    Returns the group of permutations of the generators of ``presn`` which
+    map the set of relations of ``presn`` to itself.
+
+    At most ``limit`` permutations are checked, and if the number of
+    generators is too large for every permutation to be checked, then the
+    group generated by those found is returned, which may be a proper
+    subgroup.
+
+    :param presn: the inverse monoid presentation.
+    :param limit:
+      the maximum number of permutations to check (default: ``5040``).
+    :returns: A ``list`` of ``list`` of ``int``, whose first entry is the
+      identity.
+    """
+    num_gens = len(presn.alphabet) // 2
+    found = []
+    for i, perm in enumerate(permutations(range(num_gens))):
+        if i == limit:
+            break
+        if is_automorphism(presn, perm):
+            found.append(list(perm))
+    return closure(found)
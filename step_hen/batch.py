@@ -0,0 +1,219 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2021, J. D. Mitchell + Maria Tsalakou
+#
+# Distributed under the terms of the GPL license version 3.
+#
+# The full license is in the file LICENSE, distributed with this software.
+
+r"""
+This module contains the function :py:func:`run_batch` which computes the size
+and number of :math:`\mathscr{R}`-classes of many inverse monoid presentations
+using :py:class:`step_hen.stephen.Stephen` in a number of processes, and stores
+the results in a JSON lines file, so that an interrupted batch can be resumed.
+"""
+
+import json
+import multiprocessing
+import os
+import time
+from multiprocessing.connection import wait
+from typing import Any, Dict, Iterable, Iterator, Optional
+
+from step_hen.aio import ProcessJob
+from step_hen.presentation import InverseMonoidPresentation
+from step_hen.stephen import Stephen
+
+
+def normalise(presn: InverseMonoidPresentation) -> str:
+    """
+    Returns a string which is the same for two presentations with the same
+    alphabet and the same set of relations, up to the order of the relations,
+    the order of the sides of each relation, duplicate relations, and
+    relations with equal sides.
+
+    :param presn: the inverse monoid presentation.
+    :returns: A ``str``.
+    """
+    relations = set()
+    for word1, word2 in presn.relations:
+        if word1 != word2:
+            # The shortlex greater side first
+            less, greater = sorted(
+                (tuple(word1), tuple(word2)), key=lambda w: (len(w), w)
+            )
+            relations.add((greater, less))
+    alphabet = presn.alphabet
+    if not isinstance(alphabet, str):
+        alphabet = len(alphabet) // 2
+    return json.dumps([alphabet, sorted(relations)], separators=(",", ":"))
+
+
+class _Job:  # pylint: disable=too-few-public-methods
+    # The computation run in a worker process for every presentation.
+    def __init__(self, presn: InverseMonoidPresentation, options: Dict):
+        self.presn = presn
+        self.options = options
+
+    def run(self) -> Dict[str, Any]:
+        """
+        Returns the size and number of R-classes of the presentation, and the
+        number of seconds taken to compute them.
+
+        :returns: A ``dict``.
+        """
+        start = time.perf_counter()
+        stephen = Stephen(self.presn, **self.options)
+        return {
+            "size": stephen.size(),
+            "r_classes": stephen.number_of_r_classes(),
+            "time": time.perf_counter() - start,
+        }
+
+
+def _load(path: str) -> Dict[str, Dict[str, Any]]:
+    # Returns the records with status "ok" in the file <path> by key, ignoring
+    # a final line which was only partly written.
+    result = {}
+    if not os.path.exists(path):
+        return result
+    with open(path, "r", encoding="utf-8") as file:
+        for line in file:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            if record["status"] == "ok":
+                result[record["key"]] = record
+    return result
+
+
+def _terminate_line(path: str) -> None:
+    # Appends a newline to the file <path> if its final line was only partly
+    # written, so that the records appended after it are on lines of their
+    # own.
+    if not os.path.exists(path) or os.path.getsize(path) == 0:
+        return
+    with open(path, "rb+") as file:
+        file.seek(-1, os.SEEK_END)
+        if file.read(1) != b"\n":
+            file.write(b"\n")
+
+
+def _record(
+    job: ProcessJob, key: str, elapsed: float, timeout: Optional[float]
+) -> Optional[Dict[str, Any]]:
+    # Returns the record for <job> if it has finished or timed out, and None
+    # otherwise. Reading the result can itself fail, for example if it cannot
+    # be unpickled, and this is recorded as an error.
+    record = {"key": key, "size": None, "r_classes": None}
+    try:
+        if job.done():
+            record.update(job.result(), status="ok")
+        elif timeout is not None and elapsed >= timeout:
+            record.update(status="timeout", time=elapsed)
+        else:
+            return None
+    except Exception as e:  # pylint: disable=broad-except
+        record.update(status="error", time=elapsed, error=repr(e))
+    return record
+
+
+def run_batch(  # pylint: disable=too-many-locals, too-many-branches
+    presentations: Iterable[InverseMonoidPresentation],
+    path: str,
+    max_workers: Optional[int] = None,
+    timeout: Optional[float] = None,
+    options: Optional[Dict[str, Any]] = None,
+) -> Iterator[Dict[str, Any]]:
+    r"""
+    Computes the size and number of :math:`\mathscr{R}`-classes of every
+    presentation in ``presentations``, and yields a record for every
+    presentation, in the order the computations finish.
+
+    Every record is a ``dict`` with the keys:
+
+    * ``"index"``: the position of the presentation in ``presentations``;
+    * ``"key"``: the value of :py:func:`normalise` for the presentation;
+    * ``"status"``: ``"ok"``, ``"timeout"``, or ``"error"``;
+    * ``"size"`` and ``"r_classes"``: the size and number of
+      :math:`\mathscr{R}`-classes, or ``None`` if the status is not ``"ok"``;
+    * ``"time"``: the number of seconds taken;
+    * ``"error"``: a description of the exception raised, if the status is
+      ``"error"``;
+    * ``"cached"``: ``True`` if the record was computed for a previous
+      presentation with the same key, in this or an earlier call.
+
+    Presentations with the same key are only computed once, and every result
+    computed is appended to the JSON lines file ``path`` (without the keys
+    ``"index"`` and ``"cached"``) as soon as it is known. Presentations whose
+    key is already in this file with status ``"ok"`` are not computed again,
+    and so calling this function again with the same arguments resumes an
+    interrupted batch, and retries those which timed out or failed.
+
+    :param presentations: the inverse monoid presentations.
+    :param path: the path of the file where the results are stored.
+    :param max_workers:
+      the maximum number of processes used at any time, if ``None``, the
+      number of CPUs is used (default: ``None``).
+    :param timeout:
+      the number of seconds after which the computation for any presentation
+      is terminated, if ``None``, there is no limit (default: ``None``).
+    :param options:
+      the keyword arguments given to :py:class:`step_hen.stephen.Stephen`
+      (default: ``None``).
+    :returns: An iterator of ``dict``.
+    """
+    max_workers = max_workers or multiprocessing.cpu_count()
+    options = options or {}
+    store = _load(path)
+    _terminate_line(path)
+    # The indices of the presentations waiting for the result with each key
+    waiting = {}
+    # The running jobs, and their keys and start times
+    running = {}
+    presentations = enumerate(presentations)
+    exhausted = False
+
+    with open(path, "a", encoding="utf-8") as file:
+        try:
+            while not exhausted or len(running) != 0:
+                while not exhausted and len(running) < max_workers:
+                    try:
+                        index, presn = next(presentations)
+                    except StopIteration:
+                        exhausted = True
+                        break
+                    key = normalise(presn)
+                    if key in store:
+                        yield dict(store[key], index=index, cached=True)
+                    elif key in waiting:
+                        waiting[key].append(index)
+                    else:
+                        waiting[key] = [index]
+                        job = ProcessJob(_Job(presn, options), "run")
+                        running[job] = (key, time.monotonic())
+                if len(running) == 0:
+                    continue
+                remaining = None
+                if timeout is not None:
+                    start = min(start for _, start in running.values())
+                    remaining = max(0, start + timeout - time.monotonic())
+                wait([job.connection() for job in running], remaining)
+                for job in list(running):
+                    key, start = running[job]
+                    record = _record(
+                        job, key, time.monotonic() - start, timeout
+                    )
+                    if record is None:
+                        continue
+                    job.terminate()
+                    del running[job]
+                    store[key] = record
+                    file.write(json.dumps(record) + "\n")
+                    file.flush()
+                    for i, index in enumerate(waiting.pop(key)):
+                        yield dict(record, index=index, cached=i != 0)
+        finally:
+            for job in running:
+                job.terminate()
@@ -0,0 +1,174 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2021, J. D. Mitchell + Maria Tsalakou
+#
+# Distributed under the terms of the GPL license version 3.
+#
+# The full license is in the file LICENSE, distributed with this software.
+
+"""
+This module contains the class :py:class:`DivergenceMonitor` which watches the
+progress of a (possibly non-terminating) computation, and raises a
+:py:class:`ProbablyInfiniteError` if it looks like the computation will never
+terminate. This is a heuristic, and it can be wrong in both directions.
+
+A monitor is given to :py:class:`step_hen.wordgraph.WordGraph`,
+:py:class:`step_hen.schutzenbergergraph.SchutzenbergerGraph`, or
+:py:class:`step_hen.stephen.Stephen` using the ``monitor`` parameter.
+"""
+
+# pylint: disable=bad-option-value, consider-using-f-string
+
+from typing import Any, Dict, Hashable
+
+
+class ProbablyInfiniteError(RuntimeError):
+    """
+    Raised by :py:meth:`DivergenceMonitor.observe` when the computation being
+    watched looks like it will never terminate.
+
+    The attribute ``evidence`` is a ``dict`` describing what was observed.
+    """
+
+    def __init__(self, message: str, evidence: Dict[str, Any]):
+        RuntimeError.__init__(self, message)
+        self.evidence = evidence
+
+    def __reduce__(self):
+        # The default only passes self.args to __init__, which omits evidence.
+        return (type(self), (self.args[0], self.evidence))
+
+
+class DivergenceMonitor:  # pylint: disable=too-many-instance-attributes
+    """
+    Watches a sequence of steps, each of which has a size (such as the number
+    of nodes in a word graph after the step), whether or not the step shrank
+    something (such as merging nodes), and a label (such as the index of the
+    relation applied in the step).
+
+    A :py:class:`ProbablyInfiniteError` is raised if either:
+
+    * the last ``window`` steps did not shrink anything, and the size grew
+      over those steps; or
+    * the labels of the last ``repeats`` times ``p`` steps repeat with some
+      period ``p`` of at most ``max_period``, and the size grew by the same
+      positive amount in each period. This detects, for example, a word graph
+      growing a chain of nodes labelled by powers of a letter.
+    """
+
+    def __init__(
+        self, window: int = 1000, max_period: int = 16, repeats: int = 50
+    ):
+        """
+        Construct a monitor, which has not observed any steps.
+
+        :param window:
+          the number of steps without shrinking after which the computation
+          is considered to be divergent (default: ``1000``).
+        :param max_period:
+          the maximum period of the labels checked (default: ``16``).
+        :param repeats:
+          the number of periods that must repeat (default: ``50``).
+        :raises ValueError: if any of the arguments is not positive.
+        """
+        if window <= 0 or max_period <= 0 or repeats <= 1:
+            raise ValueError(
+                "expected positive <window> and <max_period>, and <repeats> "
+                "at least 2, found %d, %d, and %d"
+                % (window, max_period, repeats)
+            )
+        self.window = window
+        self.max_period = max_period
+        self.repeats = repeats
+        self.reset()
+
+    def reset(self) -> None:
+        """
+        Forgets all of the steps observed so far.
+
+        :returns: ``None``.
+        """
+        self._steps = 0
+        # The sizes and labels of the most recent steps
+        self._sizes = []
+        self._labels = []
+        # The number of steps since, and the size at, the last step which
+        # shrank something
+        self._unshrunk = 0
+        self._size_at_shrink = None
+
+    def copy(self) -> "DivergenceMonitor":
+        """
+        Returns a monitor with the same parameters as this, which has not
+        observed any steps.
+
+        :returns: A :py:class:`DivergenceMonitor`.
+        """
+        return DivergenceMonitor(self.window, self.max_period, self.repeats)
+
+    def observe(self, size: int, shrunk: bool, label: Hashable) -> None:
+        """
+        Records a step of the computation, and raises an exception if the
+        computation looks like it will never terminate.
+
+        :param size: the size after the step.
+        :param shrunk: whether or not the step shrank anything.
+        :param label: the label of the step.
+        :returns: ``None``.
+        :raises ProbablyInfiniteError: if the computation looks divergent.
+        """
+        self._steps += 1
+        if shrunk or self._size_at_shrink is None:
+            self._unshrunk = 0
+            self._size_at_shrink = size
+        else:
+            self._unshrunk += 1
+        self._sizes.append(size)
+        self._labels.append(label)
+        length = self.max_period * (self.repeats + 1) + 1
+        if len(self._sizes) > 2 * length:
+            del self._sizes[:-length]
+            del self._labels[:-length]
+
+        if self._unshrunk >= self.window and size > self._size_at_shrink:
+            raise ProbablyInfiniteError(
+                "the size grew from %d to %d in %d steps without shrinking"
+                % (self._size_at_shrink, size, self._unshrunk),
+                {
+                    "steps": self._steps,
+                    "steps_without_shrinking": self._unshrunk,
+                    "initial_size": self._size_at_shrink,
+                    "size": size,
+                },
+            )
+        if self._steps % self.max_period == 0:
+            self._check_periodic()
+
+    def _check_periodic(self) -> None:
+        sizes, labels = self._sizes, self._labels
+        for period in range(1, self.max_period + 1):
+            length = period * self.repeats
+            if length + period >= len(labels):
+                return
+            if any(
+                labels[-i] != labels[-i - period] for i in range(1, length)
+            ):
+                continue
+            growth = sizes[-1] - sizes[-1 - period]
+            if growth <= 0 or any(
+                sizes[-1 - i * period] - sizes[-1 - (i + 1) * period]
+                != growth
+                for i in range(1, self.repeats)
+            ):
+                continue
+            raise ProbablyInfiniteError(
+                "the last %d steps repeat with period %d, and the size grows "
+                "by %d in every period" % (length, period, growth),
+                {
+                    "steps": self._steps,
+                    "period": period,
+                    "pattern": labels[-period:],
+                    "growth_per_period": growth,
+                    "size": sizes[-1],
+                },
+            )
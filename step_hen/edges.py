@@ -0,0 +1,470 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2021, J. D. Mitchell + Maria Tsalakou
+#
+# Distributed under the terms of the GPL license version 3.
+#
+# The full license is in the file LICENSE, distributed with this software.
+
+"""
+This module contains the storage backends for the edges of a
+:py:class:`step_hen.wordgraph.WordGraph`. By default the edges are stored in a
+``list`` of ``list`` objects, where ``edges[node][letter]`` is the target of
+the edge with source ``node`` and label ``letter``, or ``None``. The classes in
+this module provide the same interface using different storage.
+"""
+
+# pylint: disable=bad-option-value, consider-using-f-string
+
+import mmap
+import os
+import tempfile
+from array import array
+from typing import Any, Dict, List, Optional, Tuple
+
+
+class EdgeRow:
+    """
+    A view of the edges with a fixed source node in an :py:class:`EdgeTable`.
+    """
+
+    __slots__ = ("_table", "_node")
+
+    def __init__(self, table: "EdgeTable", node: int):
+        self._table = table
+        self._node = node
+
+    def __getitem__(self, letter: int) -> Optional[int]:
+        return self._table.get(self._node, letter)
+
+    def __setitem__(self, letter: int, target: Optional[int]) -> None:
+        self._table.set(self._node, letter, target)
+
+    def __len__(self) -> int:
+        return self._table.degree
+
+    def __iter__(self):
+        return (self[letter] for letter in range(self._table.degree))
+
+    def __eq__(self, other) -> bool:
+        return list(self) == list(other)
+
+    def __repr__(self) -> str:
+        return repr(list(self))
+
+
+class EdgeTable:
+    """
+    Base class for edge storage backends. Derived classes must implement
+    :py:meth:`get`, :py:meth:`set`, :py:meth:`add_row`, and ``__len__``.
+    """
+
+    def __init__(self, degree: int):
+        """
+        Construct an empty edge table.
+
+        :param degree: the number of letters in the alphabet.
+        """
+        self.degree = degree
+
+    def get(self, node: int, letter: int) -> Optional[int]:
+        """
+        Returns the target of the edge with source ``node`` and label
+        ``letter``, or ``None`` if there is no such edge.
+        """
+        raise NotImplementedError
+
+    def set(self, node: int, letter: int, target: Optional[int]) -> None:
+        """
+        Sets the target of the edge with source ``node`` and label ``letter``.
+        """
+        raise NotImplementedError
+
+    def add_row(self) -> None:
+        """
+        Adds a row with no edges to the end of the table.
+        """
+        raise NotImplementedError
+
+    def __len__(self) -> int:
+        raise NotImplementedError
+
+    def __getitem__(self, node: int) -> EdgeRow:
+        if not 0 <= node < len(self):
+            raise IndexError("edge table index out of range")
+        return EdgeRow(self, node)
+
+    def __iter__(self):
+        return (self[node] for node in range(len(self)))
+
+    def __eq__(self, other) -> bool:
+        return self.tolist() == [list(row) for row in other]
+
+    def __repr__(self) -> str:
+        return repr(self.tolist())
+
+    def append(self, row: List[Optional[int]]) -> None:
+        """
+        Appends the row ``row`` to the end of the table.
+        """
+        assert len(row) == self.degree
+        self.add_row()
+        node = len(self) - 1
+        for letter, target in enumerate(row):
+            if target is not None:
+                self.set(node, letter, target)
+
+    def tolist(self) -> List[List[Optional[int]]]:
+        """
+        Returns the edges as a ``list`` of ``list`` objects.
+        """
+        return [list(row) for row in self]
+
+
+class MmapEdgeTable(EdgeTable):  # pylint: disable=too-many-instance-attributes
+    """
+    An edge table stored in a memory-mapped file, so that its size is limited
+    by the available disk space and page cache rather than the heap. The file
+    grows in chunks of ``chunk`` rows.
+    """
+
+    _ITEMSIZE = array("q").itemsize
+
+    def __init__(
+        self,
+        degree: int,
+        path: Optional[str] = None,
+        chunk: int = 4096,
+        directory: Optional[str] = None,
+    ):
+        """
+        Construct an empty edge table.
+
+        :param degree: the number of letters in the alphabet.
+        :param path:
+          the path of the file to use, if ``None``, an anonymous temporary file
+          is used (default: ``None``).
+        :param chunk: the number of rows by which the file grows.
+        :param directory:
+          the directory where the anonymous temporary file is created if
+          ``path`` is ``None``, and where the files of copies of this table
+          are created, if ``None``, the default of :py:mod:`tempfile` is used,
+          which may be a file system in memory (default: ``None``).
+        """
+        EdgeTable.__init__(self, degree)
+        if path is not None and directory is None:
+            directory = os.path.dirname(os.path.abspath(path))
+        self._directory = directory
+        # pylint: disable=consider-using-with
+        if path is None:
+            self._file = tempfile.TemporaryFile(dir=directory)
+        else:
+            self._file = open(path, "w+b")
+        self._chunk = chunk
+        self._length = 0
+        self._capacity = 0
+        self._mmap = None
+        self._buffer = None
+        self._view = None
+        self._grow()
+
+    def _release(self) -> None:
+        if self._mmap is not None:
+            self._view.release()
+            self._buffer.release()
+            self._mmap.close()
+            self._mmap = self._buffer = self._view = None
+
+    def _grow(self, rows: int = 1) -> None:
+        # Grows the file by enough chunks to hold <rows> more rows.
+        self._release()
+        self._capacity += -(-rows // self._chunk) * self._chunk
+        # The file and mapping are never empty, even if the degree is 0.
+        size = max(self._capacity * self.degree * self._ITEMSIZE, 8)
+        os.ftruncate(self._file.fileno(), size)
+        self._mmap = mmap.mmap(self._file.fileno(), size)
+        self._buffer = memoryview(self._mmap)
+        self._view = self._buffer.cast("q")
+
+    def get(self, node: int, letter: int) -> Optional[int]:
+        target = self._view[node * self.degree + letter]
+        return None if target < 0 else target
+
+    def set(self, node: int, letter: int, target: Optional[int]) -> None:
+        self._view[node * self.degree + letter] = (
+            -1 if target is None else target
+        )
+
+    def add_row(self) -> None:
+        if self._length == self._capacity:
+            self._grow()
+        start = self._length * self.degree
+        for i in range(start, start + self.degree):
+            self._view[i] = -1
+        self._length += 1
+
+    def __len__(self) -> int:
+        return self._length
+
+    def buffer(self) -> memoryview:
+        """
+        Returns a ``memoryview`` of the bytes of the rows in the table, where
+        the target of every edge is a signed 64-bit integer and ``-1``
+        represents an undefined edge.
+        """
+        return self._buffer[: self._length * self.degree * self._ITEMSIZE]
+
+    def _copy_rows(self, data) -> None:
+        # Appends the rows in the bytes-like object <data>, which is in the
+        # format returned by buffer(), to this empty table.
+        rows = len(data) // max(self.degree * self._ITEMSIZE, 1)
+        if rows > self._capacity:
+            self._grow(rows - self._capacity)
+        self._buffer[: len(data)] = data
+        self._length = rows
+
+    def __getstate__(self):
+        return {
+            "degree": self.degree,
+            "chunk": self._chunk,
+            "directory": self._directory,
+            "rows": bytes(self.buffer()),
+        }
+
+    def __setstate__(self, state):
+        directory = state["directory"]
+        if directory is not None and not os.path.isdir(directory):
+            directory = None
+        self.__init__(
+            state["degree"], chunk=state["chunk"], directory=directory
+        )
+        self._copy_rows(state["rows"])
+
+    def __deepcopy__(self, _memo) -> "MmapEdgeTable":
+        # Copies the rows from one memory map to the other, without creating
+        # any Python objects for them.
+        result = MmapEdgeTable(
+            self.degree, chunk=self._chunk, directory=self._directory
+        )
+        result._copy_rows(self.buffer())
+        return result
+
+    def close(self) -> None:
+        """
+        Releases the memory map and closes the underlying file.
+        """
+        self._release()
+        self._file.close()
+
+
+class SparseEdgeRow(EdgeRow):
+    """
+    The edges with a fixed source node in a :py:class:`SparseEdgeTable`,
+    stored in a ``dict`` containing only the defined edges.
+    """
+
+    __slots__ = ("_edges", "_degree", "_source", "_incoming")
+
+    # pylint: disable=super-init-not-called
+    def __init__(self, degree: int, source: int = 0, incoming=None):
+        self._edges = {}
+        self._degree = degree
+        self._source = source
+        # The incoming edges of every node in the table containing this row,
+        # see SparseEdgeTable.incoming
+        self._incoming = {} if incoming is None else incoming
+
+    def __getitem__(self, letter: int) -> Optional[int]:
+        return self._edges.get(letter)
+
+    def __setitem__(self, letter: int, target: Optional[int]) -> None:
+        old = self._edges.get(letter)
+        if old is not None:
+            self._incoming[old].discard((self._source, letter))
+        if target is None:
+            self._edges.pop(letter, None)
+        else:
+            self._edges[letter] = target
+            self._incoming.setdefault(target, set()).add(
+                (self._source, letter)
+            )
+
+    def __len__(self) -> int:
+        return self._degree
+
+    def __iter__(self):
+        return (self._edges.get(letter) for letter in range(self._degree))
+
+    def items(self):
+        """
+        Returns an iterator over the pairs ``(letter, target)`` of the defined
+        edges.
+        """
+        return self._edges.items()
+
+
+class SparseEdgeTable(EdgeTable):
+    """
+    An edge table storing only the defined edges of every node, in a hash
+    table per node, so that its size is proportional to the number of edges
+    rather than the number of nodes times the size of the alphabet. The
+    incoming edges of every node are also stored, see :py:meth:`incoming`.
+    """
+
+    def __init__(self, degree: int):
+        """
+        Construct an empty edge table.
+
+        :param degree: the number of letters in the alphabet.
+        """
+        EdgeTable.__init__(self, degree)
+        self._rows = []
+        # self._incoming[node] is the set of pairs (source, letter) of the
+        # edges with target node
+        self._incoming = {}
+
+    def get(self, node: int, letter: int) -> Optional[int]:
+        return self._rows[node][letter]
+
+    def set(self, node: int, letter: int, target: Optional[int]) -> None:
+        self._rows[node][letter] = target
+
+    def add_row(self) -> None:
+        self._rows.append(
+            SparseEdgeRow(self.degree, len(self._rows), self._incoming)
+        )
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __getitem__(self, node: int) -> SparseEdgeRow:
+        return self._rows[node]
+
+    def incoming(self, node: int) -> List[Tuple[int, int]]:
+        """
+        Returns a list of the pairs ``(source, letter)`` such that the edge
+        with source ``source`` and label ``letter`` has target ``node``.
+        """
+        return list(self._incoming.get(node, ()))
+
+
+class CowEdgeTable(EdgeTable):
+    """
+    An edge table stored in chunks of ``chunk`` rows, which can be shared
+    between tables. A :py:meth:`snapshot` of a table shares all of its
+    chunks, and a chunk is only copied by a table when that table first
+    modifies it, so that the memory used by a snapshot is proportional to
+    the number of chunks modified since it was made.
+    """
+
+    def __init__(self, degree: int, chunk: int = 64):
+        """
+        Construct an empty edge table.
+
+        :param degree: the number of letters in the alphabet.
+        :param chunk: the number of rows in every chunk (default: ``64``).
+        """
+        EdgeTable.__init__(self, degree)
+        self._chunk = chunk
+        self._length = 0
+        # Every chunk is a list of chunk * degree targets
+        self._chunks = []
+        # The positions in self._chunks of the chunks which are not shared
+        # with any other table
+        self._owned = set()
+
+    def get(self, node: int, letter: int) -> Optional[int]:
+        chunk, row = divmod(node, self._chunk)
+        return self._chunks[chunk][row * self.degree + letter]
+
+    def set(self, node: int, letter: int, target: Optional[int]) -> None:
+        chunk, row = divmod(node, self._chunk)
+        if chunk not in self._owned:
+            self._chunks[chunk] = list(self._chunks[chunk])
+            self._owned.add(chunk)
+        self._chunks[chunk][row * self.degree + letter] = target
+
+    def add_row(self) -> None:
+        # The unused rows of the last chunk have no edges, whether or not the
+        # chunk is shared, and so only a new chunk is ever written here.
+        if self._length == len(self._chunks) * self._chunk:
+            self._owned.add(len(self._chunks))
+            self._chunks.append([None] * (self._chunk * self.degree))
+        self._length += 1
+
+    def __len__(self) -> int:
+        return self._length
+
+    def number_of_owned_chunks(self) -> int:
+        """
+        Returns the number of chunks which are not shared with another table.
+        """
+        return len(self._owned)
+
+    def snapshot(self) -> "CowEdgeTable":
+        """
+        Returns a copy of this table, which shares every chunk with this
+        table until one of them modifies it.
+        """
+        result = self._shared(
+            self.degree, self._chunk, self._length, list(self._chunks)
+        )
+        self._owned = set()
+        return result
+
+    @classmethod
+    def _shared(
+        cls, degree: int, chunk: int, length: int, chunks: List[List]
+    ) -> "CowEdgeTable":
+        # Returns a table with <length> rows stored in <chunks>, none of which
+        # it owns.
+        result = cls(degree, chunk)
+        result._length = length
+        result._chunks = chunks
+        return result
+
+
+_STORAGE = {
+    "cow": CowEdgeTable,
+    "mmap": MmapEdgeTable,
+    "sparse": SparseEdgeTable,
+}
+
+# The alphabet size above which sparse storage is used by default.
+SPARSE_DEGREE = 64
+
+
+def edge_table(
+    storage: Optional[str],
+    degree: int,
+    options: Optional[Dict[str, Any]] = None,
+):
+    """
+    Returns an empty edge table with ``degree`` letters using the storage
+    backend named ``storage``, which must be one of ``"list"``, ``"cow"``,
+    ``"mmap"``, or ``"sparse"``. If ``storage`` is ``None``, then ``"sparse"``
+    is used if ``degree`` exceeds :py:data:`SPARSE_DEGREE` and ``"list"``
+    otherwise.
+
+    The keyword arguments in ``options``, if any, are given to the constructor
+    of the backend, for example, ``{"directory": "/var/tmp", "chunk": 65536}``
+    for ``"mmap"``, see :py:class:`MmapEdgeTable`.
+
+    :raises ValueError: if ``storage`` is not the name of a storage backend,
+      or if ``options`` is given and the backend is ``"list"``.
+    """
+    if storage is None:
+        storage = "sparse" if degree > SPARSE_DEGREE else "list"
+    if storage == "list":
+        if options:
+            raise ValueError(
+                "the storage backend list does not accept any options, "
+                "found %s" % (options,)
+            )
+        return []
+    if storage not in _STORAGE:
+        raise ValueError(
+            "expected the argument <storage> to be one of %s, found %s"
+            % (", ".join(["list"] + sorted(_STORAGE)), storage)
+        )
+    return _STORAGE[storage](degree, **(options or {}))
@@ -0,0 +1,274 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2021, J. D. Mitchell + Maria Tsalakou
+#
+# Distributed under the terms of the GPL license version 3.
+#
+# The full license is in the file LICENSE, distributed with this software.
+
+"""
+This module contains the classes :py:class:`FrozenWordGraph` and
+:py:class:`FrozenSchutzenbergerGraph` which are immutable copies of finished
+:py:class:`step_hen.wordgraph.WordGraph` and
+:py:class:`step_hen.schutzenbergergraph.SchutzenbergerGraph` objects, whose
+edges are stored in a :py:class:`multiprocessing.shared_memory.SharedMemory`
+segment. Any number of threads can query a frozen graph without locks, and a
+frozen graph can be sent to other processes, which then use the same segment
+rather than a copy.
+
+This requires Python 3.8 or later.
+"""
+
+import multiprocessing
+import os
+import sys
+from array import array
+from typing import List, Optional
+
+try:
+    from multiprocessing import resource_tracker, shared_memory
+except ImportError:  # pragma: no cover
+    resource_tracker = shared_memory = None
+
+_ITEMSIZE = array("q").itemsize
+
+
+def _attach(name: str, owner_pid: int):
+    # Since Python 3.13, processes other than the owner can attach without
+    # registering the segment with the resource tracker.
+    if sys.version_info >= (3, 13):
+        # pylint: disable=unexpected-keyword-arg
+        return shared_memory.SharedMemory(name=name, track=False)
+    shm = shared_memory.SharedMemory(name=name)
+    # Before Python 3.13, attaching registers the segment with the resource
+    # tracker of this process, which unlinks it when this process exits. The
+    # owner and its child processes share the tracker with which the owner
+    # registered the segment, and it must stay registered there.
+    parent = multiprocessing.parent_process()
+    if (
+        os.name == "posix"
+        and os.getpid() != owner_pid
+        and (parent is None or parent.pid != owner_pid)
+    ):
+        # pylint: disable=protected-access
+        resource_tracker.unregister(shm._name, "shared_memory")
+    return shm
+
+
+class FrozenWordGraph:  # pylint: disable=too-many-instance-attributes
+    """
+    An immutable copy of a finished :py:class:`step_hen.wordgraph.WordGraph`,
+    whose edges are stored in shared memory. Objects of this type are created
+    using :py:meth:`step_hen.wordgraph.WordGraph.freeze`.
+
+    The nodes of a frozen graph are numbered ``0``, ``1``, ..., up to the
+    number of nodes minus ``1``, in the same order as the nodes of the
+    original graph.
+
+    Pickling a frozen graph, for example to send it to another process, only
+    pickles the name of the shared memory segment and not the edges. The
+    process that created the frozen graph owns the segment, and must keep it
+    alive until no other process is using it. Use :py:meth:`close` to detach
+    from the segment, and :py:meth:`unlink` (in the owning process) to
+    destroy it, or use the frozen graph as a context manager.
+    """
+
+    def __init__(self, graph):
+        """
+        Construct from a :py:class:`step_hen.wordgraph.WordGraph`, which is
+        run first if it is not already finished.
+
+        :param graph: the graph.
+        :raises ImportError: if :py:mod:`multiprocessing.shared_memory` is
+          not available.
+        """
+        if shared_memory is None:
+            raise ImportError(
+                "multiprocessing.shared_memory (Python 3.8+) is required"
+            )
+        graph.run()
+        index = {node: i for i, node in enumerate(graph.nodes)}
+        degree = len(graph.presn.alphabet)
+        size = max(len(graph.nodes) * degree * _ITEMSIZE, _ITEMSIZE)
+        shm = shared_memory.SharedMemory(create=True, size=size)
+        view = shm.buf.cast("q")
+        for i, node in enumerate(graph.nodes):
+            for letter in range(degree):
+                target = graph.edges[node][letter]
+                view[i * degree + letter] = -1 if target is None else index[
+                    target
+                ]
+        view.release()
+        self._setup(
+            shm,
+            True,
+            os.getpid(),
+            graph.presn,
+            graph.simplification,
+            index[graph.path(0, graph.rep)],
+            len(graph.nodes),
+        )
+
+    @classmethod
+    def _rebuild(cls, name: str, owner_pid: int, state):
+        result = cls.__new__(cls)
+        result._setup(_attach(name, owner_pid), False, owner_pid, *state)
+        return result
+
+    # pylint: disable=too-many-arguments, attribute-defined-outside-init
+    # pylint: disable=too-many-positional-arguments, bad-option-value
+    def _setup(
+        self,
+        shm,
+        owner,
+        owner_pid,
+        presn,
+        simplification,
+        rep_end,
+        num_nodes,
+    ):
+        self._shm = shm
+        self._owner = owner
+        # The id of the process which created the segment
+        self._owner_pid = owner_pid
+        self._view = shm.buf.cast("q")
+        self.presn = presn
+        self.simplification = simplification
+        self._rep_end = rep_end
+        self._num_nodes = num_nodes
+        self._degree = len(presn.alphabet)
+
+    def __reduce__(self):
+        return (
+            self._rebuild,
+            (
+                self._shm.name,
+                self._owner_pid,
+                (
+                    self.presn,
+                    self.simplification,
+                    self._rep_end,
+                    self._num_nodes,
+                ),
+            ),
+        )
+
+    def __del__(self):
+        # Releases the view of the segment before the segment itself is
+        # garbage collected, which otherwise raises BufferError.
+        if getattr(self, "_view", None) is not None:
+            self.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+        if self._owner:
+            self.unlink()
+
+    @property
+    def name(self) -> str:
+        """
+        The name of the shared memory segment containing the edges.
+        """
+        return self._shm.name
+
+    def close(self) -> None:
+        """
+        Detaches this object from the shared memory segment, after which it
+        can no longer be used.
+        """
+        if self._view is not None:
+            self._view.release()
+            self._view = None
+            self._shm.close()
+
+    def unlink(self) -> None:
+        """
+        Destroys the shared memory segment, this should only be called once,
+        by the process that created this object.
+        """
+        self._shm.unlink()
+
+    def _word(self, word: str) -> List[int]:
+        if self.simplification is not None:
+            word = self.simplification.to_simplified(word)
+        return self.presn.word(word)
+
+    def number_of_nodes(self) -> int:
+        """
+        Returns the number of nodes in the graph.
+
+        :returns: An ``int``.
+        """
+        return self._num_nodes
+
+    def target(self, node: int, letter: int) -> Optional[int]:
+        """
+        Returns the target of the edge with source ``node`` and label
+        ``letter``, or ``None`` if there is no such edge.
+
+        :param node: the source node.
+        :param letter: the edge label.
+        :returns: An ``int`` or ``None``.
+        """
+        target = self._view[node * self._degree + letter]
+        return None if target < 0 else target
+
+    def path(self, node: int, word: List[int]) -> Optional[int]:
+        """
+        Returns the target node on the path starting at ``node`` labelled by
+        ``word`` if such a node exists and ``None`` otherwise.
+
+        :param node: the source node.
+        :param word: the word (a list of ints).
+        :returns: An ``int`` or ``None``.
+        """
+        view, degree = self._view, self._degree
+        for letter in word:
+            node = view[node * degree + letter]
+            if node < 0:
+                return None
+        return node
+
+    def equal_to(self, word: str) -> bool:
+        """
+        Returns ``True`` if the argument is equal to the representative of the
+        graph, and ``False`` if it is not, see
+        :py:meth:`step_hen.wordgraph.WordGraph.equal_to`.
+
+        :param word: the word.
+        :returns: a ``bool``.
+        """
+        return self.path(0, self._word(word)) == self._rep_end
+
+
+class FrozenSchutzenbergerGraph(FrozenWordGraph):
+    """
+    An immutable copy of a finished
+    :py:class:`step_hen.schutzenbergergraph.SchutzenbergerGraph`, whose edges
+    are stored in shared memory, see :py:class:`FrozenWordGraph`. Objects of
+    this type are created using
+    :py:meth:`step_hen.schutzenbergergraph.SchutzenbergerGraph.freeze`.
+    """
+
+    def accepts(self, word: str) -> bool:
+        """
+        Returns ``True`` if ``word`` is accepted by the Schutzenberger graph,
+        see
+        :py:meth:`step_hen.schutzenbergergraph.SchutzenbergerGraph.accepts`.
+
+        :param word: the word.
+        :returns: a ``bool``.
+        """
+        return self.equal_to(word)
+
+    def __contains__(self, word: str) -> bool:
+        """
+        Returns ``True`` if ``word`` labels a path in the Schutzenberger graph.
+
+        :param word: the word.
+        :returns: a ``bool``.
+        """
+        return self.path(0, self._word(word)) is not None
@@ -0,0 +1,191 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2021, J. D. Mitchell + Maria Tsalakou
+#
+# Distributed under the terms of the GPL license version 3.
+#
+# The full license is in the file LICENSE, distributed with this software.
+
+"""
+This module contains functions which run several configurations of the same
+query in separate processes at once, return the first definitive answer, and
+terminate the remaining processes. Which configuration (for example, using the
+simplified presentation or not) finishes first varies greatly between
+presentations, and is difficult to predict.
+
+A configuration is a ``dict`` of keyword arguments for the constructor of the
+class used to answer the query.
+"""
+
+import time
+from multiprocessing.connection import wait
+from typing import Any, Dict, List, Optional, Tuple
+
+from step_hen.aio import ProcessJob
+from step_hen.presentation import InverseMonoidPresentation, MonoidPresentation
+from step_hen.schutzenbergergraph import SchutzenbergerGraph
+from step_hen.stephen import Stephen
+from step_hen.vectorised import numpy
+from step_hen.wordgraph import WordGraph
+
+
+def _default_configs() -> List[Dict[str, Any]]:
+    result = [
+        {},
+        {"simplify": True},
+        {"incremental": True},
+        {"simplify": True, "incremental": True},
+    ]
+    if numpy is not None:
+        result.append({"vectorised": True, "incremental": True})
+    return result
+
+
+def race(
+    candidates: List[Tuple[Any, str, tuple]], timeout: Optional[float] = None
+) -> Any:
+    """
+    Calls the method named ``method`` of (a copy of) ``obj`` with arguments
+    ``args`` in a separate process for every ``(obj, method, args)`` in
+    ``candidates``, and returns the first value returned which is not
+    ``None``. The other processes are then terminated.
+
+    :param candidates: the objects, methods and arguments to call.
+    :param timeout:
+      the number of seconds after which every process is terminated, if
+      ``None``, there is no deadline (default: ``None``).
+    :returns:
+      the first value returned which is not ``None``, or ``None`` if the
+      deadline passed, or every method returned ``None``.
+    :raises Exception:
+      the exception raised by the last method to finish, if every method
+      raised an exception.
+    """
+    deadline = None if timeout is None else time.monotonic() + timeout
+    jobs = [ProcessJob(obj, method, *args) for obj, method, args in candidates]
+    pending = list(jobs)
+    error, returned = None, False
+    try:
+        while len(pending) != 0:
+            remaining = None
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return None
+            ready = wait([job.connection() for job in pending], remaining)
+            for job in [job for job in pending if job.connection() in ready]:
+                if not job.done():
+                    continue
+                pending.remove(job)
+                try:
+                    result = job.result()
+                except Exception as e:  # pylint: disable=broad-except
+                    error = e
+                    continue
+                if result is not None:
+                    return result
+                returned = True
+        if not returned and error is not None:
+            raise error
+        return None
+    finally:
+        for job in jobs:
+            job.terminate()
+
+
+def equal_to(
+    presn: MonoidPresentation,
+    rep: str,
+    word: str,
+    configs: Optional[List[Dict[str, Any]]] = None,
+    timeout: Optional[float] = None,
+) -> Optional[bool]:
+    """
+    Returns the value of :py:meth:`step_hen.wordgraph.WordGraph.equal_to`,
+    for the word graph of ``rep``, with argument ``word``, computed using
+    every configuration in ``configs`` at once, see :py:func:`race`.
+
+    :param presn: the monoid presentation.
+    :param rep: the representative.
+    :param word: the word.
+    :param configs:
+      the keyword arguments of :py:class:`step_hen.wordgraph.WordGraph` for
+      every configuration, if ``None``, then a selection of the options
+      ``simplify``, ``incremental``, and ``vectorised`` (if NumPy is
+      installed) is used (default: ``None``).
+    :param timeout:
+      the deadline in seconds, or ``None`` for no deadline (default:
+      ``None``).
+    :returns: a ``bool``, or ``None`` if no answer was found.
+    """
+    if configs is None:
+        configs = _default_configs()
+    return race(
+        [
+            (WordGraph(presn, rep, **config), "equal_to", (word,))
+            for config in configs
+        ],
+        timeout,
+    )
+
+
+def accepts(
+    presn: InverseMonoidPresentation,
+    rep: str,
+    word: str,
+    configs: Optional[List[Dict[str, Any]]] = None,
+    timeout: Optional[float] = None,
+) -> Optional[bool]:
+    """
+    Returns the value of
+    :py:meth:`step_hen.schutzenbergergraph.SchutzenbergerGraph.accepts`, for
+    the Schutzenberger graph of ``rep``, with argument ``word``, computed
+    using every configuration in ``configs`` at once, see :py:func:`race`.
+
+    :param presn: the inverse monoid presentation.
+    :param rep: the representative.
+    :param word: the word.
+    :param configs:
+      the keyword arguments of
+      :py:class:`step_hen.schutzenbergergraph.SchutzenbergerGraph` for every
+      configuration, see :py:func:`equal_to` (default: ``None``).
+    :param timeout:
+      the deadline in seconds, or ``None`` for no deadline (default:
+      ``None``).
+    :returns: a ``bool``, or ``None`` if no answer was found.
+    """
+    if configs is None:
+        configs = _default_configs()
+    return race(
+        [
+            (SchutzenbergerGraph(presn, rep, **config), "accepts", (word,))
+            for config in configs
+        ],
+        timeout,
+    )
+
+
+def size(
+    presn: InverseMonoidPresentation,
+    configs: Optional[List[Dict[str, Any]]] = None,
+    timeout: Optional[float] = None,
+) -> Optional[int]:
+    """
+    Returns the value of :py:meth:`step_hen.stephen.Stephen.size` computed
+    using every configuration in ``configs`` at once, see :py:func:`race`.
+
+    :param presn: the inverse monoid presentation.
+    :param configs:
+      the keyword arguments of :py:class:`step_hen.stephen.Stephen` for every
+      configuration, if ``None``, then the presentation and its simplified
+      presentation are both used (default: ``None``).
+    :param timeout:
+      the deadline in seconds, or ``None`` for no deadline (default:
+      ``None``).
+    :returns: an ``int``, or ``None`` if the deadline passed.
+    """
+    if configs is None:
+        configs = [{}, {"simplify": True}]
+    return race(
+        [(Stephen(presn, **config), "size", ()) for config in configs], timeout
+    )
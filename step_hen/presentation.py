@@ -17,7 +17,7 @@ implemented in this package in :py:class:`stephen.wordgraph.WordGraph`,
 
 # pylint: disable=bad-option-value, consider-using-f-string
 
-from typing import List
+from typing import List, Union
 
 
 class MonoidPresentation:
@@ -25,6 +25,10 @@ class MonoidPresentation:
     This class is used to define monoid presentations.  The alphabet is set
     using the method :py:meth:`set_alphabet`, and relations can be added using
     :py:meth:`add_relation`.
+
+    The alphabet is either a string, whose characters are the letters, or a
+    number ``n`` in which case the letters are the integers ``0``, ``1``,
+    ..., ``n - 1`` and words are lists of integers.
     """
 
     def __init__(self):
@@ -34,12 +38,22 @@ class MonoidPresentation:
         self.alphabet = ""
         self.relations = []
 
-    def letter(self, string: str) -> int:
+    def _integer_alphabet(self) -> bool:
+        return isinstance(self.alphabet, range)
+
+    def letter(self, string: Union[str, int]) -> int:
         """
         Converts a string of length 1 to its index in the alphabet of this.
 
         This is the inverse of :py:meth:`char`.
         """
+        if self._integer_alphabet():
+            if not isinstance(string, int) or string not in self.alphabet:
+                raise ValueError(
+                    "letter %s does not belong to the alphabet %s"
+                    % (string, self.alphabet)
+                )
+            return string
         assert len(string) == 1
         if not string[0] in self.alphabet:
             raise ValueError(
@@ -48,7 +62,7 @@ class MonoidPresentation:
             )
         return self.alphabet.index(string)
 
-    def char(self, index: int) -> str:
+    def char(self, index: int) -> Union[str, int]:
         """
         Converts a integer to the corresponding letter of the alphabet of this
         .
@@ -57,35 +71,57 @@ class MonoidPresentation:
         assert index < len(self.alphabet)
         return self.alphabet[index]
 
-    def word(self, string: str) -> List[int]:
+    def word(self, string: Union[str, List[int]]) -> List[int]:
         """
         Converts a string to the corresponding list of ints.
         """
         return [self.letter(x) for x in string]
 
-    def string(self, word: List[int]) -> str:
+    def string(self, word: List[int]) -> Union[str, List[int]]:
         """
-        Converts a list of ints to the corresponding string.
+        Converts a list of ints to the corresponding string, or list of ints
+        if the alphabet consists of integers.
         """
+        if self._integer_alphabet():
+            return [self.char(x) for x in word]
         return "".join(self.char(x) for x in word)
 
-    def set_alphabet(self, alphabet: str) -> None:
+    def _is_word(self, word) -> bool:
+        if self._integer_alphabet():
+            return isinstance(word, (list, tuple))
+        return isinstance(word, str)
+
+    def set_alphabet(self, alphabet: Union[str, int]) -> None:
         """
         Set the alphabet of the presentation.
 
-        :param alphabet: the string containing the alphabet.
+        :param alphabet:
+          the string containing the alphabet, or the number of letters in the
+          alphabet.
         :returns: ``None``.
         :raises ValueError:
           If the alphabet has already been set.
         :raises ValueError:
           If the parameter ``alphabet`` contains duplicate letters.
+        :raises ValueError:
+          If the parameter ``alphabet`` is a negative integer.
         :raises TypeError:
-          If the alphabet is not a string.`
+          If the alphabet is not a string or an integer.`
         """
-        if not isinstance(alphabet, str):
-            raise TypeError("the argument <alphabet> must be a string")
-        if self.alphabet != "":
+        integer = isinstance(alphabet, int) and not isinstance(alphabet, bool)
+        if not (integer or isinstance(alphabet, str)):
+            raise TypeError(
+                "the argument <alphabet> must be a string or an integer"
+            )
+        if len(self.alphabet) != 0:
             raise ValueError("the alphabet cannot be set more than once")
+        if integer:
+            if alphabet < 0:
+                raise ValueError(
+                    "the argument <alphabet> must not be negative"
+                )
+            self.alphabet = range(alphabet)
+            return
 
         letters = {}
         for letter in alphabet:
@@ -96,7 +132,9 @@ class MonoidPresentation:
             letters[letter] = True
         self.alphabet = alphabet
 
-    def add_relation(self, word1: str, word2: str) -> None:
+    def add_relation(
+        self, word1: Union[str, List[int]], word2: Union[str, List[int]]
+    ) -> None:
         """
         Add a relation to the presentation.
 
@@ -108,15 +146,17 @@ class MonoidPresentation:
         :raises ValueError:
           If ``word1`` or ``word2`` contains a letter not in the alphabet.
         :raises TypeError:
-          If ``word1`` or ``word2`` is not a string.
+          If ``word1`` or ``word2`` is not a string, or a list of ints if the
+          alphabet consists of integers.
         """
-        if self.alphabet == "":
+        if len(self.alphabet) == 0:
             raise ValueError("no alphabet defined, use set_alphabet() first")
 
-        if not isinstance(word1, str):
-            raise TypeError("the argument <word1> must be a string")
-        if not isinstance(word2, str):
-            raise TypeError("the argument <word2> must be a string")
+        kind = "a list" if self._integer_alphabet() else "a string"
+        if not self._is_word(word1):
+            raise TypeError("the argument <word1> must be %s" % kind)
+        if not self._is_word(word2):
+            raise TypeError("the argument <word2> must be %s" % kind)
 
         word1 = [self.letter(x) for x in word1]
         word2 = [self.letter(x) for x in word2]
@@ -130,7 +170,9 @@ class InverseMonoidPresentation(MonoidPresentation):
     using :py:meth:`add_relation`.
 
     Letters in the alphabet must be lower case, and upper case letters are used
-    for the inverse of a letter.
+    for the inverse of a letter. If the alphabet is a number ``n``, then the
+    letters ``0``, ``1``, ..., ``n - 1`` are the generators, and the inverse
+    of ``i`` is ``i + n``.
     """
 
     def __init__(self):
@@ -143,11 +185,12 @@ class InverseMonoidPresentation(MonoidPresentation):
         half = len(self.alphabet) // 2
         return letter + half if letter < half else letter - half
 
-    def set_alphabet(self, alphabet: str) -> None:
+    def set_alphabet(self, alphabet: Union[str, int]) -> None:
         """
         Set the alphabet of the presentation.
 
-        :param alphabet: the string containing the alphabet.
+        :param alphabet:
+          the string containing the alphabet, or the number of generators.
         :returns: ``None``.
         :raises ValueError:
           If the alphabet has already been set.
@@ -155,10 +198,17 @@ class InverseMonoidPresentation(MonoidPresentation):
           If the parameter ``alphabet`` contains duplicate letters.
         :raises ValueError:
           If the parameter ``alphabet`` contains upper case letters.
+        :raises ValueError:
+          If the parameter ``alphabet`` is a negative integer.
         :raises TypeError:
-          If the alphabet is not a string.`
+          If the alphabet is not a string or an integer.`
         """
-        if not all(x.islower() for x in alphabet):
+        if isinstance(alphabet, str) and not all(
+            x.islower() for x in alphabet
+        ):
             raise ValueError("the letters in the alphabet must be lower case")
         MonoidPresentation.set_alphabet(self, alphabet)  # for the exceptions
-        self.alphabet += alphabet.upper()
+        if self._integer_alphabet():
+            self.alphabet = range(2 * len(self.alphabet))
+        else:
+            self.alphabet += alphabet.upper()
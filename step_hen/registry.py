@@ -0,0 +1,151 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2021, J. D. Mitchell + Maria Tsalakou
+#
+# Distributed under the terms of the GPL license version 3.
+#
+# The full license is in the file LICENSE, distributed with this software.
+
+r"""
+This module contains the single class
+:py:class:`SchutzenbergerGraphRegistry` which stores one
+:py:class:`step_hen.schutzenbergergraph.SchutzenbergerGraph` per
+:math:`\mathscr{R}`-class, and reuses it for every representative in that
+:math:`\mathscr{R}`-class.
+"""
+
+from typing import List, Tuple
+
+from step_hen.presentation import InverseMonoidPresentation
+from step_hen.schutzenbergergraph import SchutzenbergerGraph
+
+
+class SchutzenbergerGraphRegistry:
+    r"""
+    This class stores the Schutzenberger graphs of the representatives given
+    to it, computing at most one graph per :math:`\mathscr{R}`-class.
+
+    The Schutzenberger graphs of :math:`\mathscr{R}`-related words :math:`u`
+    and :math:`v` are the same graph with different endpoints for the
+    representative. If a word :math:`v` labels a path in the graph of
+    :math:`u`, then :math:`uu ^ {-1} \leq vv ^ {-1}`, and if some prefix of
+    :math:`v` is known to be :math:`\mathscr{R}`-related to :math:`u`, then
+    :math:`vv ^ {-1} \leq uu ^ {-1}` also, and so :math:`v` and :math:`u` are
+    :math:`\mathscr{R}`-related. In this case, the graph of :math:`u` is
+    re-targeted to :math:`v` without running the algorithm again. Otherwise,
+    the graph of :math:`v` is computed, and it is only stored if :math:`v` is
+    not :math:`\mathscr{R}`-related to any previously given word.
+
+    If relations are added to the presentation, then the stored graphs are
+    discarded the next time that the registry is used.
+    """
+
+    def __init__(self, presn: InverseMonoidPresentation):
+        """
+        Construct an empty registry.
+
+        :param presn: the inverse monoid presentation.
+        """
+        self.presn = presn
+        # self._graphs[i] is the (finished) graph of the i-th R-class
+        self._graphs = []
+        # self._members[w] is the index in self._graphs of the R-class of the
+        # word w (a tuple of ints), for every w known to be in the R-class
+        self._members = {}
+        # The number of relations in self.presn when the graphs were computed
+        self._num_relations = len(presn.relations)
+
+    def _check_presn(self) -> None:
+        # Discards the graphs if relations were added to self.presn since they
+        # were computed, since they may no longer be Schutzenberger graphs.
+        if self._num_relations != len(self.presn.relations):
+            self._graphs = []
+            self._members = {}
+            self._num_relations = len(self.presn.relations)
+
+    def number_of_graphs(self) -> int:
+        r"""
+        Returns the number of graphs, or equivalently the number of distinct
+        :math:`\mathscr{R}`-classes, in the registry.
+
+        :returns: An ``int``.
+        """
+        self._check_presn()
+        return len(self._graphs)
+
+    def _certified(self, word: Tuple[int], index: int) -> bool:
+        # Returns True if a prefix of <word> belongs to the R-class with index
+        # <index>.
+        return any(
+            self._members.get(word[:i]) == index for i in range(len(word) + 1)
+        )
+
+    def _index(self, word: List[int]) -> int:
+        self._check_presn()
+        word = tuple(word)
+        if word in self._members:
+            return self._members[word]
+        schutz_graph = None
+        for index, other in enumerate(self._graphs):
+            if other.path(0, list(word)) is None:
+                continue
+            if not self._certified(word, index):
+                if schutz_graph is None:
+                    schutz_graph = SchutzenbergerGraph(
+                        self.presn, self.presn.string(word)
+                    )
+                    schutz_graph.run()
+                if schutz_graph.path(0, other.rep) is None:
+                    continue
+            self._members[word] = index
+            return index
+        if schutz_graph is None:
+            schutz_graph = SchutzenbergerGraph(
+                self.presn, self.presn.string(word)
+            )
+            schutz_graph.run()
+        self._members[word] = len(self._graphs)
+        self._graphs.append(schutz_graph)
+        return len(self._graphs) - 1
+
+    def schutzenberger_graph(self, rep: str) -> SchutzenbergerGraph:
+        r"""
+        Returns the (finished) Schutzenberger graph of ``rep``.
+
+        The returned graph is a copy of the graph stored for the
+        :math:`\mathscr{R}`-class of ``rep``, see
+        :py:meth:`step_hen.schutzenbergergraph.SchutzenbergerGraph.retarget`.
+
+        :param rep: the representative.
+        :returns: A :py:class:`SchutzenbergerGraph`.
+
+        .. warning::
+            This method does not terminate if the
+            :math:`\mathscr{R}`-class of ``rep`` is infinite.
+        """
+        index = self._index(self.presn.word(rep))
+        return self._graphs[index].retarget(rep)
+
+    def equal(self, word1: str, word2: str) -> bool:
+        r"""
+        Returns ``True`` if ``word1`` and ``word2`` represent the same element
+        of the inverse monoid defined by the presentation, and ``False`` if
+        they do not.
+
+        At most one Schutzenberger graph is computed per
+        :math:`\mathscr{R}`-class, and both words are registered.
+
+        :param word1: the first word.
+        :param word2: the second word.
+        :returns: A ``bool``.
+
+        .. warning::
+            This method does not terminate if the
+            :math:`\mathscr{R}`-class of either word is infinite.
+        """
+        word1, word2 = self.presn.word(word1), self.presn.word(word2)
+        index = self._index(word1)
+        if self._index(word2) != index:
+            return False
+        schutz_graph = self._graphs[index]
+        return schutz_graph.path(0, word1) == schutz_graph.path(0, word2)
@@ -13,6 +13,13 @@ two words in the free monoid represent the same element of a finitely presented
 inverse monoid.
 """
 
+import copy
+from typing import Any, Dict, Optional
+
+from step_hen.aio import QueryPool, run_in_process
+from step_hen.edges import edge_table
+from step_hen.frozen import FrozenSchutzenbergerGraph
+from step_hen.divergence import DivergenceMonitor
 from step_hen.presentation import InverseMonoidPresentation
 from step_hen.wordgraph import WordGraph
 
@@ -30,14 +37,62 @@ class SchutzenbergerGraph(WordGraph):
     can be added using :py:meth:`add_relation`.
     """
 
-    def __init__(self, presn: InverseMonoidPresentation, rep: str):
+    # pylint: disable=too-many-arguments, too-many-positional-arguments
+    # pylint: disable=bad-option-value
+    def __init__(
+        self,
+        presn: InverseMonoidPresentation,
+        rep: str,
+        simplify: bool = False,
+        storage: Optional[str] = None,
+        vectorised: bool = False,
+        incremental: bool = False,
+        budget: Optional[int] = None,
+        monitor: Optional[DivergenceMonitor] = None,
+        storage_options: Optional[Dict[str, Any]] = None,
+    ):
         """
         Construct from a monoid presentation and a representative.
 
         :param presn: the inverse monoid presentation.
         :param rep: the representative.
+        :param simplify:
+          if ``True``, then the graph is constructed using the
+          :py:class:`step_hen.simplify.SimplifiedPresentation` of ``presn``
+          (default: ``False``).
+        :param storage:
+          the name of the backend used to store the edges of the graph, see
+          :py:class:`step_hen.wordgraph.WordGraph` (default: ``None``).
+        :param vectorised:
+          if ``True``, then relations are checked at all nodes at once using
+          NumPy, see :py:class:`step_hen.wordgraph.WordGraph` (default:
+          ``False``).
+        :param incremental:
+          if ``True``, then :py:meth:`accepts` and ``__contains__`` return
+          ``True`` as soon as the answer is known (default: ``False``).
+        :param budget:
+          the maximum number of elementary expansions performed by each call
+          to :py:meth:`accepts` (default: ``None``).
+        :param monitor:
+          the :py:class:`step_hen.divergence.DivergenceMonitor` watching
+          :py:meth:`run`, see :py:class:`step_hen.wordgraph.WordGraph`
+          (default: ``None``).
+        :param storage_options:
+          keyword arguments for the storage backend, see
+          :py:class:`step_hen.wordgraph.WordGraph` (default: ``None``).
         """
-        WordGraph.__init__(self, presn, rep)
+        WordGraph.__init__(
+            self,
+            presn,
+            rep,
+            simplify,
+            storage,
+            vectorised,
+            incremental,
+            budget,
+            monitor,
+            storage_options,
+        )
 
     def target(self, node: int, letter: int) -> int:
         result = WordGraph.target(self, node, letter)
@@ -47,7 +102,7 @@ class SchutzenbergerGraph(WordGraph):
         self.edges[result][inverse_letter] = node
         return result
 
-    def accepts(self, word: str) -> bool:
+    def accepts(self, word: str) -> Optional[bool]:
         r"""
         Returns ``True`` if ``word`` is accepted by the Schutzenberger graph.
         This means that the paths starting at the first node ``0`` labelled by
@@ -59,8 +114,13 @@ class SchutzenbergerGraph(WordGraph):
         if their respective ``SchutzenbergerGraph`` objects both accept the
         other word.
 
+        If this instance was constructed with ``incremental=True``, then
+        ``True`` is returned as soon as it is known, and if the ``budget``
+        given at construction runs out before the answer is known, then
+        ``None`` is returned.
+
         :param word: the word.
-        :returns: a ``bool``.
+        :returns: a ``bool``, or ``None``.
 
         .. warning::
             The procedure implemented by method may never terminate. In
@@ -69,9 +129,100 @@ class SchutzenbergerGraph(WordGraph):
             construction is finite.  Even if the :math:`\mathscr{R}`-class is
             finite, there is no bound on the run time of this method.
         """
-        self.run()
-        word = [self.presn.letter(x) for x in word]
-        return self.path(0, word) == self.path(0, self.rep)
+        return self._equal_to(self._word(word))
+
+    async def accepts_async(
+        self,
+        word: str,
+        timeout: Optional[float] = None,
+        pool: Optional[QueryPool] = None,
+    ) -> Optional[bool]:
+        """
+        Returns the same value as :py:meth:`accepts` but runs the algorithm,
+        on a copy of this instance, in a separate process which is terminated
+        if the awaiting task is cancelled or ``timeout`` seconds pass.
+
+        :param word: the word.
+        :param timeout:
+          the deadline in seconds, or ``None`` for no deadline (default:
+          ``None``).
+        :param pool:
+          the :py:class:`step_hen.aio.QueryPool` limiting the number of
+          concurrent processes, or ``None`` for no limit (default: ``None``).
+        :returns: a ``bool``, or ``None`` if the deadline passed.
+        """
+        return await run_in_process(
+            self, "accepts", word, timeout=timeout, pool=pool
+        )
+
+    def freeze(self) -> FrozenSchutzenbergerGraph:
+        r"""
+        Runs the algorithm to completion, and returns an immutable copy of the
+        Schutzenberger graph whose edges are stored in shared memory, see
+        :py:class:`step_hen.frozen.FrozenSchutzenbergerGraph`.
+
+        :returns: A :py:class:`step_hen.frozen.FrozenSchutzenbergerGraph`.
+
+        .. warning::
+            This method does not terminate if the :math:`\mathscr{R}`-class
+            of the representative is infinite.
+        """
+        return FrozenSchutzenbergerGraph(self)
+
+    def retarget(self, rep: str) -> "SchutzenbergerGraph":
+        r"""
+        Returns the Schutzenberger graph of ``rep`` obtained from this graph
+        by moving the endpoint of the representative, without running the
+        algorithm again. The returned graph is a :py:meth:`snapshot` of this
+        graph, and so either can be modified independently of the other.
+
+        This is only valid if ``rep`` is :math:`\mathscr{R}`-related to the
+        representative of this graph, which is not checked, see
+        :py:class:`step_hen.registry.SchutzenbergerGraphRegistry`.
+
+        :param rep: the new representative.
+        :returns: A :py:class:`SchutzenbergerGraph`.
+        :raises ValueError: if ``rep`` does not label a path in the graph.
+        """
+        if rep not in self:
+            raise ValueError(
+                "the argument <rep> must label a path in the graph"
+            )
+        result = self.snapshot()
+        result.rep = self._word(rep)
+        return result
+
+    def reroot(self, node: int, rep: str) -> "SchutzenbergerGraph":
+        r"""
+        Returns the Schutzenberger graph of ``rep`` obtained from this
+        (finished) graph by making ``node`` the root, without running the
+        algorithm again. The nodes of the returned graph are renumbered as in
+        :py:meth:`canonical_form`.
+
+        If :math:`v` labels a path from the root to ``node``, then
+        :math:`v ^ {-1}w` is :math:`\mathscr{L}`-related to the
+        representative :math:`w` of this graph, and this is only valid if
+        ``rep`` represents :math:`v ^ {-1}w`, which is not checked. In
+        particular, if :math:`x ^ {-1}` labels a path from the root, for a
+        letter :math:`x`, then the graph of :math:`xw` is obtained by
+        re-rooting at the end of that path.
+
+        :param node: the new root.
+        :param rep: the new representative.
+        :returns: A :py:class:`SchutzenbergerGraph`.
+        """
+        form = self.canonical_form(node)
+        result = copy.copy(self)
+        result.edges = edge_table(
+            self._storage, len(self.presn.alphabet), self._storage_options
+        )
+        for row in form:
+            result.edges.append(row)
+        result.nodes = list(range(len(form)))
+        result.next_node = len(form)
+        result.kappa = []
+        result.rep = self._word(rep)
+        return result
 
     def __contains__(self, word: str) -> bool:
         r"""
@@ -82,6 +233,10 @@ class SchutzenbergerGraph(WordGraph):
         :math:`\mathscr{R}`-related if and only if either word labels a path in
         the Schutzenberger graph of the other.
 
+        If this instance was constructed with ``incremental=True``, then
+        ``True`` is returned as soon as it is known. The ``budget`` given at
+        construction does not apply to this method.
+
         :param word: The word.
         :returns: A ``bool``.
 
@@ -92,8 +247,11 @@ class SchutzenbergerGraph(WordGraph):
             construction is finite.  Even if the :math:`\mathscr{R}`-class is
             finite.
         """
-        self.run()
-        word = [self.presn.letter(letter) for letter in word]
+        word = self._word(word)
+        if self.incremental:
+            self.run(lambda: self.path(0, word) is not None)
+        else:
+            self.run()
         return self.path(0, word) is not None
 
     def equal_to(self, word: str) -> None:
@@ -0,0 +1,141 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2021, J. D. Mitchell + Maria Tsalakou
+#
+# Distributed under the terms of the GPL license version 3.
+#
+# The full license is in the file LICENSE, distributed with this software.
+
+"""
+This module contains the single class :py:class:`SharedWordGraph` which is a
+:py:class:`step_hen.wordgraph.WordGraph` containing the paths labelled by many
+words, so that the elementary expansions and merges required to check the
+equality of any pair of these words are performed only once.
+"""
+
+from typing import Any, Dict, List, Optional
+
+from step_hen.divergence import DivergenceMonitor
+from step_hen.presentation import MonoidPresentation
+from step_hen.wordgraph import WordGraph
+
+
+class SharedWordGraph(WordGraph):
+    r"""
+    This class implements Stephen's procedure for (possibly) checking whether
+    any two of a collection of words in the free monoid represent the same
+    element of a finitely presented monoid, using a single word graph.
+
+    Every word added to the graph labels a path starting at the node ``0``.
+    The steps of the algorithm only ever add paths labelled by one side of a
+    relation where there is already a path labelled by the other side, or
+    identify the end points of two such paths. Hence if the paths labelled by
+    ``u`` and ``v`` from ``0`` end at the same node, then ``u`` and ``v``
+    represent the same element of the monoid. Conversely, once every relation
+    holds at every node, any sequence of applications of relations
+    transforming ``u`` into ``v`` can be traced in the graph, and so the paths
+    labelled by ``u`` and ``v`` end at the same node if ``u`` and ``v`` are
+    equal. Unlike the graph of a single representative, the finished graph
+    contains one node per element of the union of the "prefix closures" of
+    all of the words added, and this is computed at most once.
+
+    .. warning::
+        This does not apply to Schutzenberger graphs of inverse monoids, where
+        the graph of a word :math:`w` also contains the path labelled by
+        :math:`ww ^ {-1}`. The graph containing the paths of several words
+        from the same node is the Schutzenberger graph of the product of their
+        idempotents, and not that of any one of them.
+    """
+
+    # pylint: disable=too-many-arguments, too-many-positional-arguments
+    # pylint: disable=bad-option-value
+    def __init__(
+        self,
+        presn: MonoidPresentation,
+        simplify: bool = False,
+        storage: Optional[str] = None,
+        vectorised: bool = False,
+        incremental: bool = False,
+        budget: Optional[int] = None,
+        monitor: Optional[DivergenceMonitor] = None,
+        storage_options: Optional[Dict[str, Any]] = None,
+    ):
+        """
+        Construct from a monoid presentation, the graph initially contains
+        only the path labelled by the empty word.
+
+        :param presn: the monoid presentation.
+        :param simplify:
+          see :py:class:`step_hen.wordgraph.WordGraph` (default: ``False``).
+        :param storage:
+          see :py:class:`step_hen.wordgraph.WordGraph` (default: ``None``).
+        :param vectorised:
+          see :py:class:`step_hen.wordgraph.WordGraph` (default: ``False``).
+        :param incremental:
+          if ``True``, then :py:meth:`equal` stops running the algorithm as
+          soon as the two words are known to be equal (default: ``False``).
+        :param budget:
+          the maximum number of elementary expansions performed by each call
+          to :py:meth:`equal`, if ``None``, there is no limit (default:
+          ``None``).
+        :param monitor:
+          see :py:class:`step_hen.wordgraph.WordGraph` (default: ``None``).
+        :param storage_options:
+          see :py:class:`step_hen.wordgraph.WordGraph` (default: ``None``).
+        """
+        WordGraph.__init__(
+            self,
+            presn,
+            "",
+            simplify=simplify,
+            storage=storage,
+            vectorised=vectorised,
+            incremental=incremental,
+            budget=budget,
+            monitor=monitor,
+            storage_options=storage_options,
+        )
+
+    def _add_word(self, word: List[int]) -> None:
+        node = 0
+        for letter in word:
+            node = self.target(node, letter)
+
+    def add_word(self, word: str) -> None:
+        """
+        Adds the path labelled by ``word`` starting at the node ``0``. If the
+        graph was already finished, then the next call to :py:meth:`run`
+        continues from the current graph.
+
+        :param word: the word.
+        :returns: ``None``.
+        """
+        self._add_word(self._word(word))
+
+    def equal(self, word1: str, word2: str) -> Optional[bool]:
+        """
+        Returns ``True`` if ``word1`` and ``word2`` represent the same element
+        of the monoid defined by the presentation, and ``False`` if they do
+        not. Both words are added to the graph (using :py:meth:`add_word`) if
+        necessary.
+
+        If this instance was constructed with ``incremental=True``, then
+        ``True`` is returned as soon as it is known. If the ``budget`` given
+        at construction runs out before the answer is known, then ``None`` is
+        returned, and calling this method again continues from where it
+        stopped.
+
+        :param word1: the first word.
+        :param word2: the second word.
+        :returns: a ``bool``, or ``None``.
+
+        .. warning::
+            The procedure implemented by method may never terminate, see
+            :py:meth:`step_hen.wordgraph.WordGraph.equal_to`.
+        """
+        word1, word2 = self._word(word1), self._word(word2)
+        self._add_word(word1)
+        self._add_word(word2)
+        return self._query(
+            lambda: self.path(0, word1) == self.path(0, word2)
+        )
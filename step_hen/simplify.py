@@ -0,0 +1,241 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2021, J. D. Mitchell + Maria Tsalakou
+#
+# Distributed under the terms of the GPL license version 3.
+#
+# The full license is in the file LICENSE, distributed with this software.
+
+"""
+This module contains the single class :py:class:`SimplifiedPresentation` which
+can be used to simplify a presentation, without changing the monoid (or
+inverse monoid) that it defines, before it is used as the input to
+:py:class:`step_hen.wordgraph.WordGraph`,
+:py:class:`step_hen.schutzenbergergraph.SchutzenbergerGraph`, or
+:py:class:`step_hen.Stephen`.
+"""
+
+from typing import List, Tuple, Union
+
+from step_hen.presentation import MonoidPresentation, InverseMonoidPresentation
+
+
+def _shortlex_less(word1: List[int], word2: List[int]) -> bool:
+    return (len(word1), word1) < (len(word2), word2)
+
+
+def _orient(
+    word1: List[int], word2: List[int]
+) -> Tuple[List[int], List[int]]:
+    # Returns the relation (word1, word2) with the shortlex greater side first.
+    if _shortlex_less(word1, word2):
+        return (word2, word1)
+    return (word1, word2)
+
+
+def _rewrite(word: List[int], rules: List[Tuple[List[int], List[int]]]):
+    # Rewrite <word> using <rules>, which are all shortlex decreasing, until no
+    # further rule applies. This terminates because shortlex is a well-order.
+    word = list(word)
+    changed = True
+    while changed:
+        changed = False
+        for lhs, rhs in rules:
+            if len(lhs) == 0:
+                continue
+            for i in range(len(word) - len(lhs) + 1):
+                if word[i : i + len(lhs)] == lhs:
+                    word[i : i + len(lhs)] = rhs
+                    changed = True
+                    break
+            if changed:
+                break
+    return word
+
+
+class SimplifiedPresentation:
+    """
+    This class simplifies a :py:class:`MonoidPresentation` or
+    :py:class:`InverseMonoidPresentation` using Tietze transformations, so
+    that the simplified presentation defines the same monoid as the original.
+    The simplified presentation is available as the attribute ``presn`` and
+    the original as ``original``.
+
+    The following simplifications are performed:
+
+    * duplicate relations and relations with equal sides are removed;
+    * each side of every relation is rewritten using the other relations,
+      oriented by the shortlex order, in a bounded number of rounds;
+    * generators ``a`` occurring in a relation ``a = w``, where ``w`` does not
+      contain ``a`` (or its inverse), are eliminated by replacing ``a`` by
+      ``w`` everywhere.
+
+    Words over the original alphabet can be converted to words over the
+    simplified alphabet using :py:meth:`to_simplified`, and back again using
+    :py:meth:`to_original`.
+    """
+
+    def __init__(
+        self,
+        presn: MonoidPresentation,
+        rounds: int = 4,
+        eliminate_generators: bool = True,
+    ):
+        """
+        Construct from a monoid or inverse monoid presentation.
+
+        :param presn: the presentation to simplify.
+        :param rounds:
+          the maximum number of rounds of rewriting and generator elimination
+          to perform (default: ``4``).
+        :param eliminate_generators:
+          whether or not to eliminate redundant generators (default:
+          ``True``).
+        """
+        self.original = presn
+        self._inverse = isinstance(presn, InverseMonoidPresentation)
+        # self._substitution[i] is the word in the original alphabet which
+        # replaces the letter with index i when a word is simplified.
+        self._substitution = {}
+
+        relations = self._remove_redundant(
+            [_orient(list(u), list(v)) for u, v in presn.relations]
+        )
+        for _ in range(rounds):
+            changed = self._reduce_relations(relations)
+            if eliminate_generators:
+                changed = self._eliminate_generators(relations) or changed
+            if not changed:
+                break
+
+        # The remaining letters are numbered in the same order as in the
+        # original alphabet, so that the inverses of generators still follow
+        # the generators in an inverse monoid presentation.
+        remaining = self._remaining_letters()
+        self._new_letter = {x: i for i, x in enumerate(remaining)}
+        self._old_letter = remaining
+        generators = remaining
+        if self._inverse:
+            generators = remaining[: len(remaining) // 2]
+
+        self.presn = type(presn)()
+        if isinstance(presn.alphabet, range):
+            self.presn.set_alphabet(len(generators))
+        else:
+            self.presn.set_alphabet("".join(presn.char(x) for x in generators))
+        for word1, word2 in relations:
+            self.presn.add_relation(
+                self.presn.string([self._new_letter[x] for x in word1]),
+                self.presn.string([self._new_letter[x] for x in word2]),
+            )
+
+    def _invert(self, word: List[int]) -> List[int]:
+        return [self.original.inverse(x) for x in reversed(word)]
+
+    def _remaining_letters(self) -> List[int]:
+        return [
+            x
+            for x in range(len(self.original.alphabet))
+            if x not in self._substitution
+        ]
+
+    @staticmethod
+    def _remove_redundant(relations):
+        result, seen = [], set()
+        for word1, word2 in relations:
+            key = (tuple(word1), tuple(word2))
+            if word1 != word2 and key not in seen:
+                seen.add(key)
+                result.append((word1, word2))
+        return result
+
+    def _reduce_relations(self, relations) -> bool:
+        # Rewrite each relation using all of the others, in place. Every step
+        # replaces a relation by one that is a consequence of it and the
+        # remaining relations, and vice versa, and so the monoid defined is
+        # unchanged.
+        changed = False
+        i = 0
+        while i < len(relations):
+            word1, word2 = relations[i]
+            rules = relations[:i] + relations[i + 1 :]
+            new = _orient(_rewrite(word1, rules), _rewrite(word2, rules))
+            if new[0] == new[1] or new in rules:
+                del relations[i]
+                changed = True
+                continue
+            if new != relations[i]:
+                relations[i] = new
+                changed = True
+            i += 1
+        return changed
+
+    def _eliminate_generators(self, relations) -> bool:
+        changed = False
+        half = len(self.original.alphabet) // 2
+        while len(self._remaining_letters()) > (2 if self._inverse else 1):
+            candidates = []
+            for i, (word1, word2) in enumerate(relations):
+                for letter, word in ((word1, word2), (word2, word1)):
+                    if len(letter) != 1:
+                        continue
+                    letter = letter[0]
+                    if self._inverse and letter >= half:
+                        letter = self.original.inverse(letter)
+                        word = self._invert(word)
+                    forbidden = {letter}
+                    if self._inverse:
+                        forbidden.add(self.original.inverse(letter))
+                    if not any(x in forbidden for x in word):
+                        candidates.append((len(word), i, letter, word))
+            if len(candidates) == 0:
+                break
+            _, i, letter, word = min(candidates)
+            del relations[i]
+            replace = {letter: word}
+            if self._inverse:
+                replace[self.original.inverse(letter)] = self._invert(word)
+            for j, (word1, word2) in enumerate(relations):
+                relations[j] = _orient(
+                    self._substitute(word1, replace),
+                    self._substitute(word2, replace),
+                )
+            for key, value in self._substitution.items():
+                self._substitution[key] = self._substitute(value, replace)
+            self._substitution.update(replace)
+            relations[:] = self._remove_redundant(relations)
+            changed = True
+        return changed
+
+    @staticmethod
+    def _substitute(word: List[int], replace) -> List[int]:
+        result = []
+        for letter in word:
+            result.extend(replace.get(letter, (letter,)))
+        return result
+
+    def to_simplified(
+        self, word: Union[str, List[int]]
+    ) -> Union[str, List[int]]:
+        """
+        Converts a word over the alphabet of the original presentation to an
+        equal word over the alphabet of the simplified presentation.
+
+        :param word: the word over the original alphabet.
+        :returns: A ``str``, or a ``list`` for integer alphabets.
+        """
+        word = self._substitute(self.original.word(word), self._substitution)
+        return self.presn.string([self._new_letter[x] for x in word])
+
+    def to_original(
+        self, word: Union[str, List[int]]
+    ) -> Union[str, List[int]]:
+        """
+        Converts a word over the alphabet of the simplified presentation to an
+        equal word over the alphabet of the original presentation.
+
+        :param word: the word over the simplified alphabet.
+        :returns: A ``str``, or a ``list`` for integer alphabets.
+        """
+        word = self.presn.word(word)
+        return self.original.string([self._old_letter[x] for x in word])
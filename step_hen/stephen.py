@@ -12,24 +12,91 @@ version of Stephen's procedure for computing the size and number of
 :math:`\mathscr{R}`-classes of a finitely presented inverse monoid.
 """
 
+# pylint: disable=bad-option-value, consider-using-f-string
+
+import copy
+from typing import List, Optional, Union
+
+from step_hen import automorphisms as autos
+from step_hen.aio import QueryPool, run_in_process
+from step_hen.divergence import DivergenceMonitor
 from step_hen.schutzenbergergraph import (
     InverseMonoidPresentation,
     SchutzenbergerGraph,
 )
+from step_hen.simplify import SimplifiedPresentation
+
+
+class _RClass:  # pylint: disable=too-few-public-methods
+    # The part of a finished SchutzenbergerGraph kept by Stephen in low memory
+    # mode, once the left multiples of its rep have been found.
+    def __init__(self, schutz_graph: SchutzenbergerGraph):
+        self.rep = schutz_graph.rep
+        self._number_of_nodes = schutz_graph.number_of_nodes()
+
+    def number_of_nodes(self) -> int:
+        """
+        Returns the number of nodes in the Schutzenberger graph that this
+        object replaced.
+
+        :returns: An ``int``.
+        """
+        return self._number_of_nodes
 
 
-class Stephen:
+class Stephen:  # pylint: disable=too-many-instance-attributes
     """
     The class encodes a rudimentary version of Stephen's procedure as described
     in :cite:`Cutting2001aa`
     """
 
-    def __init__(self, presn: InverseMonoidPresentation) -> None:
-        """
+    def __init__(
+        self,
+        presn: InverseMonoidPresentation,
+        simplify: bool = False,
+        low_memory: bool = False,
+        automorphisms: Union[bool, List[List[int]]] = False,
+        monitor: Optional[DivergenceMonitor] = None,
+    ) -> None:
+        r"""
         Construct a new :py:class:`Stephen` from an inverse monoid presentation.
 
         :param presn: the inverse monoid presentation
         :type presn: InverseMonoidPresentation
+        :param simplify:
+          if ``True``, then the
+          :py:class:`step_hen.simplify.SimplifiedPresentation` of ``presn`` is
+          used in place of ``presn`` (default: ``False``).
+        :type simplify: bool
+        :param low_memory:
+          if ``True``, then the Schutzenberger graph of every
+          :math:`\mathscr{R}`-class is discarded once the
+          :math:`\mathscr{R}`-classes of the left multiples of its
+          representative are known, keeping only its representative, number
+          of nodes, and :py:meth:`step_hen.wordgraph.WordGraph.fingerprint`
+          (default: ``False``).
+        :type low_memory: bool
+        :param automorphisms:
+          if ``True``, then the permutations of the generators preserving the
+          relations are found using
+          :py:func:`step_hen.automorphisms.automorphisms`, and if it is a list
+          of such permutations (of the generators of the presentation used),
+          then the group they generate is used. The Schutzenberger graphs of
+          only one :math:`\mathscr{R}`-class in every orbit of this group are
+          computed (default: ``False``).
+        :type automorphisms: bool or list
+        :param monitor:
+          if not ``None``, then a copy of this
+          :py:class:`step_hen.divergence.DivergenceMonitor` watches every
+          Schutzenberger graph computed, and the monitor itself is given the
+          number of :math:`\mathscr{R}`-classes found, whether the left
+          multiple belongs to a known :math:`\mathscr{R}`-class, and the
+          letter, after every left multiplication (default: ``None``).
+        :type monitor: DivergenceMonitor
+
+        :raises ValueError:
+          if ``automorphisms`` contains a permutation not preserving the
+          relations.
 
         :returns: ``None``
 
@@ -45,35 +112,176 @@ class Stephen:
 
             S = Stephen(P)
         """
+        self._simplification = None
+        if simplify:
+            self._simplification = SimplifiedPresentation(presn)
+            presn = self._simplification.presn
         self._presn = presn
-        self._orbit = [SchutzenbergerGraph(presn, "")]
+        # True if self._presn is a copy made by add_relation
+        self._owns_presn = False
+        self._low_memory = low_memory
+        self._monitor = monitor
+        if not isinstance(automorphisms, bool):
+            for perm in automorphisms:
+                if not autos.is_automorphism(presn, perm):
+                    raise ValueError(
+                        "expected a permutation of the generators preserving "
+                        "the relations, found %s" % (perm,)
+                    )
+        self._automorphisms = automorphisms
+        # The permutations of the alphabet induced by the group generated by
+        # self._automorphisms, set by __run
+        self._group = None
+        # One SchutzenbergerGraph per R-class (or an _RClass in low memory
+        # mode), filled in by __run
+        self._orbit = []
+        # self._fingerprints[f] is the position in self._orbit of the R-class
+        # whose SchutzenbergerGraph has fingerprint f, or the least fingerprint
+        # in its orbit under self._group
+        self._fingerprints = {}
+        # self._multiplicity[i] is the number of R-classes in the orbit of
+        # self._orbit[i] under self._group
+        self._multiplicity = []
+        # Graphs kept from before relations were added, by rep, see
+        # add_relation
+        self._cache = {}
         self._finished = False
         self._graph = []
         # self._graph[i][j] will contain the position of the SchutzenbergerGraph
         # in self._orbit containing the rep of self._orbit[i] left multiplied by
-        # letter[j]
+        # letter[j] (or an image of it under self._group)
+
+    def _schutzenberger_graph(self, rep: List[int]) -> SchutzenbergerGraph:
+        sg_xw = self._cache.pop(tuple(rep), None)
+        if sg_xw is None:
+            monitor = None
+            if self._monitor is not None:
+                monitor = self._monitor.copy()
+            sg_xw = SchutzenbergerGraph(
+                self._presn, self._presn.string(rep), monitor=monitor
+            )
+        return sg_xw
+
+    def add_relation(self, word1: str, word2: str) -> None:
+        r"""
+        Add a relation to the presentation used by this instance.
+
+        The presentation given at construction is not modified. The first
+        call to this method replaces the presentation used by this instance
+        by a copy, so that the relation is not added to any other object using
+        the same presentation.
+
+        The Schutzenberger graphs already computed are kept, and they continue
+        from their current state when they are next required, only the
+        bookkeeping of the :math:`\mathscr{R}`-classes is started again.
+        Any automorphisms given at construction which do not preserve the new
+        relations are no longer used.
+
+        :param word1: the left hand side of the relation to add.
+        :param word2: the right hand side of the relation to add.
+        :returns: ``None``.
+        """
+        if not self._owns_presn:
+            if self._simplification is not None:
+                self._simplification = copy.deepcopy(self._simplification)
+                self._presn = self._simplification.presn
+            else:
+                self._presn = copy.deepcopy(self._presn)
+            self._owns_presn = True
+        if self._simplification is not None:
+            word1 = self._simplification.to_simplified(word1)
+            word2 = self._simplification.to_simplified(word2)
+        self._presn.add_relation(word1, word2)
+        self._cache.update(
+            (tuple(sg.rep), sg)
+            for sg in self._orbit
+            if isinstance(sg, SchutzenbergerGraph)
+        )
+        # The graphs kept continue with the new relation
+        for sg in self._cache.values():
+            sg.presn = self._presn
+        if not isinstance(self._automorphisms, bool):
+            self._automorphisms = [
+                perm
+                for perm in self._automorphisms
+                if autos.is_automorphism(self._presn, perm)
+            ]
+        if self._monitor is not None:
+            self._monitor.reset()
+        self._group = None
+        self._orbit = []
+        self._fingerprints = {}
+        self._multiplicity = []
+        self._graph = []
+        self._finished = False
+
+    def _r_class(
+        self,
+        schutz_graph: SchutzenbergerGraph,
+        root: int = 0,
+        rep: Optional[List[int]] = None,
+    ) -> int:
+        # Returns the position in self._orbit of the R-class of the graph
+        # <schutz_graph> rooted at <root>, or of the representative of its
+        # orbit under self._group, adding it if it is not already there, where
+        # <rep> is the representative of the R-class if <root> is not 0. Two
+        # words are R-related if and only if their Schutzenberger graphs are
+        # isomorphic as rooted graphs, since then each word labels a path in
+        # the graph of the other. The graph of the image of a word under an
+        # automorphism is the graph of the word with its labels permuted.
+        schutz_graph.run()
+        fingerprints = {
+            schutz_graph.fingerprint(root, perm) for perm in self._group
+        }
+        fingerprint = min(fingerprints)
+        index = self._fingerprints.get(fingerprint)
+        if index is None:
+            index = len(self._orbit)
+            self._fingerprints[fingerprint] = index
+            self._multiplicity.append(len(fingerprints))
+            if root != 0:
+                schutz_graph = schutz_graph.reroot(
+                    root, self._presn.string(rep)
+                )
+            self._orbit.append(schutz_graph)
+        return index
 
     def __run(self) -> None:
         if self._finished:
             return
+        if self._automorphisms is True:
+            group = autos.automorphisms(self._presn)
+        elif self._automorphisms is False:
+            group = []
+        else:
+            group = autos.closure(self._automorphisms)
+        self._group = [autos.extend(self._presn, perm) for perm in group[1:]]
+        self._group.insert(0, None)
+        self._r_class(self._schutzenberger_graph([]))
         for i, sg1 in enumerate(self._orbit):
             word = sg1.rep
             self._graph.append([-1] * len(self._presn.alphabet))
             for letter in range(len(self._presn.alphabet)):
                 rep = [letter] + word
-                sg_xw = SchutzenbergerGraph(
-                    self._presn, self._presn.string(rep)
-                )
-                for k, sg2 in enumerate(self._orbit):
-                    if (
-                        self._presn.string(rep) in sg2
-                        and self._presn.string(sg2.rep) in sg_xw
-                    ):
-                        self._graph[i][letter] = k
-                        break
+                num_r_classes = len(self._orbit)
+                # If the inverse of <letter> labels a path from the root, then
+                # rep is L-related to word, and its graph is that of word
+                # re-rooted at the end of the path.
+                root = sg1.path(0, [self._presn.inverse(letter)])
+                if root is None:
+                    index = self._r_class(self._schutzenberger_graph(rep))
                 else:
-                    self._graph[i][letter] = len(self._orbit)
-                    self._orbit.append(sg_xw)
+                    index = self._r_class(sg1, root, rep)
+                self._graph[i][letter] = index
+                if self._monitor is not None:
+                    self._monitor.observe(
+                        len(self._orbit),
+                        len(self._orbit) == num_r_classes,
+                        letter,
+                    )
+            if self._low_memory:
+                self._orbit[i] = _RClass(sg1)
+        self._cache.clear()
         self._finished = True
 
     def size(self) -> int:
@@ -106,10 +314,28 @@ class Stephen:
         """
         self.__run()
         result = 0
-        for schutz_graph in self._orbit:
-            result += schutz_graph.number_of_nodes()
+        for schutz_graph, multiplicity in zip(self._orbit, self._multiplicity):
+            result += multiplicity * schutz_graph.number_of_nodes()
         return result
 
+    async def size_async(
+        self, timeout: Optional[float] = None, pool: Optional[QueryPool] = None
+    ) -> Optional[int]:
+        """
+        Returns the same value as :py:meth:`size` but runs the algorithm, on a
+        copy of this instance, in a separate process which is terminated if
+        the awaiting task is cancelled or ``timeout`` seconds pass.
+
+        :param timeout:
+          the deadline in seconds, or ``None`` for no deadline (default:
+          ``None``).
+        :param pool:
+          the :py:class:`step_hen.aio.QueryPool` limiting the number of
+          concurrent processes, or ``None`` for no limit (default: ``None``).
+        :returns: An ``int``, or ``None`` if the deadline passed.
+        """
+        return await run_in_process(self, "size", timeout=timeout, pool=pool)
+
     def number_of_r_classes(self) -> int:
         r"""
         Returns the number of :math:`\mathscr{R}`-classes of the inverse monoid
@@ -139,4 +365,4 @@ class Stephen:
             S.number_of_r_classes()  # returns 3
         """
         self.__run()
-        return len(self._orbit)
+        return sum(self._multiplicity)
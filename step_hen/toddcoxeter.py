@@ -0,0 +1,197 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2021, J. D. Mitchell + Maria Tsalakou
+#
+# Distributed under the terms of the GPL license version 3.
+#
+# The full license is in the file LICENSE, distributed with this software.
+
+"""
+This module contains the single class :py:class:`ToddCoxeter` which implements
+a version of the Todd-Coxeter procedure, using the elementary expansions and
+coincidences of :py:class:`step_hen.wordgraph.WordGraph`, for computing the
+right Cayley graph of a finitely presented monoid.
+"""
+
+from bisect import bisect_left, bisect_right
+from typing import Any, Callable, Dict, List, Optional
+
+from step_hen.presentation import MonoidPresentation
+from step_hen.wordgraph import WordGraph
+
+
+class ToddCoxeter(WordGraph):
+    """
+    This class implements a version of the Todd-Coxeter procedure for
+    (possibly) computing the right Cayley graph of a finitely presented monoid.
+    The nodes of the graph, once it is complete, correspond to the elements of
+    the monoid, and node ``0`` is the identity.
+
+    The elements of the monoid are numbered from ``0`` to :py:meth:`size`
+    minus ``1`` in the order of their nodes, so that the identity is ``0``.
+
+    .. warning::
+        The procedure implemented by this class terminates if and only if the
+        monoid defined by the presentation is finite. Even if the monoid is
+        finite, there is no bound on the run time.
+    """
+
+    def __init__(
+        self,
+        presn: MonoidPresentation,
+        simplify: bool = False,
+        storage: Optional[str] = None,
+        storage_options: Optional[Dict[str, Any]] = None,
+    ):
+        """
+        Construct from a monoid presentation.
+
+        :param presn: the monoid presentation.
+        :param simplify:
+          if ``True``, then the
+          :py:class:`step_hen.simplify.SimplifiedPresentation` of ``presn`` is
+          used (default: ``False``).
+        :param storage:
+          the name of the backend used to store the edges of the graph, see
+          :py:class:`step_hen.wordgraph.WordGraph` (default: ``None``).
+        :param storage_options:
+          keyword arguments for the storage backend, see
+          :py:class:`step_hen.wordgraph.WordGraph` (default: ``None``).
+        """
+        WordGraph.__init__(
+            self, presn, "", simplify, storage, storage_options=storage_options
+        )
+
+    def run(
+        self,
+        until: Optional[Callable[[], bool]] = None,
+        budget: Optional[int] = None,
+    ) -> None:
+        """
+        Runs the algorithm.
+
+        Every node, in increasing order, is processed by tracing every relation
+        from that node, defining new nodes when necessary, identifying the
+        end points of the two sides, and then defining the edges with every
+        label.
+
+        :param until:
+          a function with no arguments which is called after every elementary
+          expansion and the resulting merges, the algorithm stops if it
+          returns ``True`` (default: ``None``).
+        :param budget:
+          the maximum number of elementary expansions to perform, or ``None``
+          for no limit (default: ``None``).
+        """
+        if self._is_finished() or (until is not None and until()):
+            return
+        expansions = 0
+        index = 0
+        while index < len(self.nodes):
+            node = self.nodes[index]
+            for word1, word2 in self.presn.relations:
+                if budget is not None and expansions == budget:
+                    return
+                target = node
+                for letter in word1:
+                    target = self.target(target, letter)
+                self.elementary_expansion(node, word1, word2)
+                expansions += 1
+                while len(self.kappa) != 0:
+                    self.merge_nodes(*self.kappa.pop())
+                if until is not None and until():
+                    return
+                if not self._is_active(node):
+                    break
+            else:
+                for letter in range(len(self.presn.alphabet)):
+                    self.target(node, letter)
+            # Nodes are only ever added at the end, and self.nodes is sorted.
+            index = bisect_right(self.nodes, node)
+        self._finish()
+
+    def size(self) -> int:
+        """
+        Returns the size of the monoid defined by the presentation.
+
+        :returns: An ``int``.
+        """
+        self.run()
+        return self.number_of_nodes()
+
+    def element(self, word: str) -> int:
+        """
+        Returns the number of the element of the monoid represented by
+        ``word``.
+
+        :param word: the word.
+        :returns: An ``int``.
+        """
+        self.run()
+        return bisect_left(self.nodes, self.path(0, self._word(word)))
+
+    def _normal_forms(self) -> Dict[int, List[int]]:
+        # Returns the shortlex least word labelling a path from 0 to every
+        # node, found by a breadth first search.
+        words = {0: []}
+        queue = [0]
+        i = 0
+        while i < len(queue):
+            node = queue[i]
+            for letter in range(len(self.presn.alphabet)):
+                target = self.edges[node][letter]
+                if target not in words:
+                    words[target] = words[node] + [letter]
+                    queue.append(target)
+            i += 1
+        return words
+
+    def normal_forms(self) -> List[str]:
+        """
+        Returns a list whose ``i``-th entry is the shortlex least word
+        representing the element with number ``i``.
+
+        The words are over the alphabet of the presentation used to construct
+        this. If ``simplify`` was ``True``, then the shortlex least words over
+        the simplified alphabet are converted using
+        :py:meth:`step_hen.simplify.SimplifiedPresentation.to_original`, and
+        so they need not be shortlex least over the original alphabet.
+
+        :returns: A ``list`` of ``str``.
+        """
+        self.run()
+        words = self._normal_forms()
+        result = [self.presn.string(words[node]) for node in self.nodes]
+        if self.simplification is not None:
+            result = [self.simplification.to_original(w) for w in result]
+        return result
+
+    def right_cayley_graph(self) -> List[List[int]]:
+        """
+        Returns the right Cayley graph of the monoid, as a list whose ``i``-th
+        entry is the list of the numbers of the products of the element with
+        number ``i`` and every letter.
+
+        :returns: A ``list`` of ``list`` of ``int``.
+        """
+        self.run()
+        return [
+            [bisect_left(self.nodes, target) for target in self.edges[node]]
+            for node in self.nodes
+        ]
+
+    def multiplication_table(self) -> List[List[int]]:
+        """
+        Returns the multiplication table of the monoid, as a list whose
+        ``[i][j]``-th entry is the number of the product of the elements with
+        numbers ``i`` and ``j``.
+
+        :returns: A ``list`` of ``list`` of ``int``.
+        """
+        self.run()
+        words = self._normal_forms()
+        words = [words[node] for node in self.nodes]
+        return [
+            [bisect_left(self.nodes, self.path(node, word)) for word in words]
+            for node in self.nodes
+        ]
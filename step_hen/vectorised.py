@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2021, J. D. Mitchell + Maria Tsalakou
+#
+# Distributed under the terms of the GPL license version 3.
+#
+# The full license is in the file LICENSE, distributed with this software.
+
+"""
+This module contains functions for checking the relations of a presentation
+at every node of a :py:class:`step_hen.wordgraph.WordGraph` at once using
+NumPy. NumPy is an optional dependency of ``step_hen``, and is only required
+by the functions in this module.
+"""
+
+from typing import List, Tuple
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover
+    numpy = None
+
+from step_hen.edges import MmapEdgeTable
+
+
+def _check_numpy() -> None:
+    if numpy is None:
+        raise ImportError(
+            "NumPy is required for the vectorised relation sweep"
+        )
+
+
+def edge_matrix(edges) -> "numpy.ndarray":
+    """
+    Returns the edges ``edges`` of a word graph as a NumPy array with one more
+    row than ``edges``. The last row is a sink: every undefined edge in
+    ``edges``, and every edge of the sink, has the sink as its target.
+
+    :param edges: the edges of a :py:class:`step_hen.wordgraph.WordGraph`.
+    :returns: A ``numpy.ndarray`` of ``numpy.int64``.
+    """
+    _check_numpy()
+    sink = len(edges)
+    degree = len(edges[0]) if sink > 0 else 0
+    if isinstance(edges, MmapEdgeTable):
+        result = numpy.frombuffer(
+            edges.buffer(), dtype=numpy.int64, count=sink * degree
+        ).reshape(sink, degree)
+        result = numpy.where(result < 0, sink, result)
+    else:
+        result = numpy.array(
+            [[sink if x is None else x for x in row] for row in edges],
+            dtype=numpy.int64,
+        ).reshape(sink, degree)
+    return numpy.vstack(
+        [result, numpy.full((1, degree), sink, dtype=numpy.int64)]
+    )
+
+
+def relation_sweep(
+    nodes: List[int], edges, relations: List[Tuple[List[int], List[int]]]
+) -> List[Tuple[int, int]]:
+    """
+    Returns every pair ``(node, index)`` such that the paths starting at
+    ``node`` labelled by the two sides of ``relations[index]`` do not end at
+    the same node (or are not both undefined).
+
+    For every side of every relation, the end points of the paths from all of
+    the nodes are computed together using one gather per letter.
+
+    :param nodes: the (active) nodes of the word graph.
+    :param edges: the edges of the word graph.
+    :param relations: the relations.
+    :returns: A ``list`` of pairs of ``int``, sorted by node.
+    """
+    matrix = edge_matrix(edges)
+    starts = numpy.array(nodes, dtype=numpy.int64)
+    differ = numpy.zeros((len(nodes), len(relations)), dtype=bool)
+    for index, (word1, word2) in enumerate(relations):
+        end1, end2 = starts, starts
+        for letter in word1:
+            end1 = matrix[end1, letter]
+        for letter in word2:
+            end2 = matrix[end2, letter]
+        differ[:, index] = end1 != end2
+    positions, indices = numpy.nonzero(differ)
+    return [
+        (nodes[position], int(index))
+        for position, index in zip(positions.tolist(), indices.tolist())
+    ]
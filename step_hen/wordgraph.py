@@ -13,11 +13,27 @@ two words in the free monoid represent the same element of a finitely presented
 monoid.
 """
 
-from typing import Union, List, Tuple
+import copy
+import hashlib
+import itertools
+from array import array
+from bisect import bisect_left
+from typing import Any, Callable, Dict, Union, List, Optional, Tuple
+from step_hen.aio import QueryPool, run_in_process
+from step_hen.divergence import DivergenceMonitor
+from step_hen.edges import (
+    CowEdgeTable,
+    SparseEdgeRow,
+    SparseEdgeTable,
+    edge_table,
+)
+from step_hen.frozen import FrozenWordGraph
 from step_hen.presentation import MonoidPresentation
+from step_hen.simplify import SimplifiedPresentation
+from step_hen.vectorised import relation_sweep, numpy
 
 
-class WordGraph:
+class WordGraph:  # pylint: disable=too-many-instance-attributes
     """
     This class implements Stephen's procedure for (possibly) checking whether
     an arbitrary word in the free monoid represents the same element of a
@@ -27,23 +43,132 @@ class WordGraph:
 
     """
 
-    def __init__(self, presn: MonoidPresentation, rep: str):
+    # pylint: disable=too-many-arguments, too-many-positional-arguments
+    # pylint: disable=bad-option-value
+    def __init__(
+        self,
+        presn: MonoidPresentation,
+        rep: str,
+        simplify: bool = False,
+        storage: Optional[str] = None,
+        vectorised: bool = False,
+        incremental: bool = False,
+        budget: Optional[int] = None,
+        monitor: Optional[DivergenceMonitor] = None,
+        storage_options: Optional[Dict[str, Any]] = None,
+    ):
         """
         Construct from a monoid presentation and a representative.
 
         :param presn: the monoid presentation.
         :param rep: the representative.
+        :param simplify:
+          if ``True``, then the graph is constructed using the
+          :py:class:`step_hen.simplify.SimplifiedPresentation` of ``presn``,
+          and every word given as an argument to this instance is converted to
+          the simplified alphabet (default: ``False``).
+        :param storage:
+          the name of the backend used to store the edges of the graph, one of
+          ``"list"`` (a ``list`` of ``list`` objects), ``"mmap"`` (a
+          memory-mapped file, see :py:class:`step_hen.edges.MmapEdgeTable`),
+          ``"sparse"`` (a hash table per node, see
+          :py:class:`step_hen.edges.SparseEdgeTable`), ``"cow"`` (shared
+          chunks which are copied on write, see
+          :py:class:`step_hen.edges.CowEdgeTable` and :py:meth:`snapshot`),
+          or ``None`` in which
+          case ``"sparse"`` is used for alphabets with more than
+          :py:data:`step_hen.edges.SPARSE_DEGREE` letters and ``"list"``
+          otherwise (default: ``None``).
+        :param vectorised:
+          if ``True``, then :py:meth:`run` finds the nodes where relations do
+          not hold using :py:func:`step_hen.vectorised.relation_sweep`, which
+          requires NumPy (default: ``False``).
+        :param incremental:
+          if ``True``, then :py:meth:`equal_to` (and the similar methods of
+          derived classes) stops running the algorithm as soon as the answer
+          is known to be ``True`` (default: ``False``).
+        :param budget:
+          the maximum number of elementary expansions performed by each call
+          to :py:meth:`equal_to`, if ``None``, there is no limit (default:
+          ``None``).
+        :param monitor:
+          if not ``None``, then :py:meth:`run` reports the number of nodes,
+          whether any nodes were merged, and the index of the relation used,
+          after every elementary expansion to this
+          :py:class:`step_hen.divergence.DivergenceMonitor`, which raises a
+          :py:class:`step_hen.divergence.ProbablyInfiniteError` if the graph
+          appears to be growing forever (default: ``None``).
+        :param storage_options:
+          keyword arguments for the constructor of the storage backend, for
+          example ``{"directory": "/var/tmp"}`` to keep the file of
+          ``storage="mmap"`` out of a temporary directory held in memory, see
+          :py:func:`step_hen.edges.edge_table` (default: ``None``).
+        :raises ImportError: if ``vectorised`` is ``True`` and NumPy is not
+          installed.
         """
+        if vectorised and numpy is None:
+            raise ImportError("NumPy is required when <vectorised> is True")
+        self.vectorised = vectorised
+        self.incremental = incremental
+        self.budget = budget
+        self.monitor = monitor
+        self.simplification = None
+        if simplify:
+            self.simplification = SimplifiedPresentation(presn)
+            presn = self.simplification.presn
         self.presn = presn
+        # True if self.presn is a copy made by add_relation, which is not
+        # used by any other object
+        self._owns_presn = False
         self.nodes = [0]
-        self.edges = [[None] * len(self.presn.alphabet)]
+        self._storage = storage
+        self._storage_options = storage_options
+        self.edges = edge_table(
+            storage, len(self.presn.alphabet), storage_options
+        )
+        self._add_row()
         self.kappa = []
         self.next_node = 1
-        self.rep = [self.presn.letter(a) for a in rep]
+        # True if run() has completed and the graph has not changed since
+        self._finished = False
+        # The number of relations in self.presn when run() last completed
+        self._num_relations = 0
+        self.rep = self._word(rep)
         current_node = 0
         for letter in self.rep:
             current_node = self.target(current_node, letter)
 
+    def _word(self, word: str) -> List[int]:
+        # Converts a word given as an argument to this into a list of ints,
+        # via the simplified alphabet if there is one.
+        if self.simplification is not None:
+            word = self.simplification.to_simplified(word)
+        return self.presn.word(word)
+
+    def _add_row(self) -> None:
+        # Adds a row with no edges to the end of self.edges.
+        if isinstance(self.edges, list):
+            self.edges.append([None] * len(self.presn.alphabet))
+        else:
+            self.edges.add_row()
+
+    def _finish(self) -> None:
+        self._finished = True
+        self._num_relations = len(self.presn.relations)
+
+    def _is_finished(self) -> bool:
+        # Relations may have been added to the presentation since run() last
+        # completed, in which case it continues from the current graph.
+        return self._finished and self._num_relations == len(
+            self.presn.relations
+        )
+
+    def _is_active(self, node: int) -> bool:
+        # Returns True if <node> has not been merged into another node, using
+        # the fact that self.nodes is sorted.
+        index = bisect_left(self.nodes, node)
+        return index < len(self.nodes) and self.nodes[index] == node
+
     def number_of_nodes(self) -> int:
         """
         Returns the number of nodes in the graph.
@@ -53,6 +178,87 @@ class WordGraph:
         """
         return len(self.nodes)
 
+    def canonical_form(
+        self, root: int = 0, permutation: Optional[List[int]] = None
+    ) -> List[List[Optional[int]]]:
+        """
+        Returns the edges of the subgraph induced by the nodes reachable from
+        ``root``, where the nodes are renumbered in the order they are visited
+        by a breadth first search from ``root`` following the edges in order of
+        their labels.
+
+        The canonical forms of two graphs (with respect to their given roots)
+        are equal if and only if there is an isomorphism between their
+        reachable subgraphs preserving the labels of the edges and mapping the
+        one root to the other. This does not run the algorithm.
+
+        :param root: the root node (default: ``0``).
+        :param permutation:
+          a permutation of the alphabet, if not ``None``, then the canonical
+          form of the graph obtained by replacing every edge label ``a`` by
+          ``permutation[a]`` is returned (default: ``None``).
+        :returns: A ``list`` of ``list`` of ``int`` or ``None``.
+        """
+        return self._canonical_form(root, permutation, None)
+
+    def _canonical_form(
+        self, root: int, permutation: Optional[List[int]], undefined
+    ) -> List[List[Optional[int]]]:
+        # Returns canonical_form(root, permutation) with <undefined> in place
+        # of None. Only the defined edges of sparse rows are visited.
+        letters = range(len(self.presn.alphabet))
+        if permutation is not None:
+            letters = sorted(letters, key=lambda x: permutation[x])
+        # position[a] is the position of the letter a in letters
+        position = [0] * len(letters)
+        for i, letter in enumerate(letters):
+            position[letter] = i
+        index = {root: 0}
+        queue = [root]
+        result = []
+        while len(result) < len(queue):
+            edges = self.edges[queue[len(result)]]
+            if isinstance(edges, SparseEdgeRow):
+                pairs = sorted(
+                    (position[letter], target)
+                    for letter, target in edges.items()
+                )
+            else:
+                pairs = enumerate(edges[letter] for letter in letters)
+            row = [undefined] * len(letters)
+            for i, target in pairs:
+                if target is None:
+                    continue
+                if target not in index:
+                    index[target] = len(queue)
+                    queue.append(target)
+                row[i] = index[target]
+            result.append(row)
+        return result
+
+    def fingerprint(
+        self, root: int = 0, permutation: Optional[List[int]] = None
+    ) -> bytes:
+        """
+        Returns the SHA-256 digest of :py:meth:`canonical_form`, which
+        (barring hash collisions) identifies the graph up to isomorphism,
+        using much less memory than the graph itself.
+
+        :param root: the root node (default: ``0``).
+        :param permutation:
+          a permutation of the alphabet, see :py:meth:`canonical_form`
+          (default: ``None``).
+        :returns: A ``bytes`` object of length ``32``.
+        """
+        return hashlib.sha256(
+            array(
+                "q",
+                itertools.chain.from_iterable(
+                    self._canonical_form(root, permutation, -1)
+                ),
+            ).tobytes()
+        ).digest()
+
     def target(self, node: int, letter: int) -> int:
         """
         Returns the target node of the edge with source ``node`` and label
@@ -63,9 +269,10 @@ class WordGraph:
         :returns: An ``int``.
         """
         if self.edges[node][letter] is None:
+            self._finished = False
             self.nodes.append(self.next_node)
             self.edges[node][letter] = self.next_node
-            self.edges.append([None] * len(self.presn.alphabet))
+            self._add_row()
             self.next_node += 1
         return self.edges[node][letter]
 
@@ -104,37 +311,124 @@ class WordGraph:
         node, index = self.last_node_on_path(node, word)
         return node if index == len(word) else None
 
-    def run(self) -> None:
+    def run(
+        self,
+        until: Optional[Callable[[], bool]] = None,
+        budget: Optional[int] = None,
+    ) -> None:
         """
         Runs the algorithm.
+
+        :param until:
+          a function with no arguments which is called after every elementary
+          expansion and the resulting merges, the algorithm stops if it
+          returns ``True`` (default: ``None``).
+        :param budget:
+          the maximum number of elementary expansions to perform, or ``None``
+          for no limit (default: ``None``).
         """
+        if self._is_finished() or (until is not None and until()):
+            return
+        if self.vectorised:
+            self._run_vectorised(until, budget)
+            return
+        expansions = 0
         while True:
-            node, word1, word2 = next(
+            node, index, word1, word2 = next(
                 (
-                    (node, word1, word2)
+                    (node, index, word1, word2)
                     for node in self.nodes
-                    for word1, word2 in self.presn.relations
+                    for index, (word1, word2) in enumerate(
+                        self.presn.relations
+                    )
                     if self.path(node, word1) != self.path(node, word2)
                 ),
-                (None, None, None),
+                (None, None, None, None),
             )
             if node is None:
                 break
+            if budget is not None and expansions == budget:
+                return
             self.elementary_expansion(node, word1, word2)
+            expansions += 1
             assert (
                 self.path(node, word1) is not None
                 and self.path(node, word2) is not None
             )
-            while len(self.kappa) != 0:
-                self.merge_nodes(*self.kappa.pop())
+            self._process_coincidences(index)
+            if until is not None and until():
+                return
+        self._finish()
+
+    def _process_coincidences(self, index: int) -> None:
+        # Merges the pairs of nodes in self.kappa, after an elementary
+        # expansion with the relation with index <index>, and reports the
+        # step to self.monitor.
+        merged = len(self.kappa) != 0
+        while len(self.kappa) != 0:
+            self.merge_nodes(*self.kappa.pop())
+        if self.monitor is not None:
+            self.monitor.observe(self.number_of_nodes(), merged, index)
+
+    def _run_vectorised(self, until, budget) -> None:
+        # Every sweep finds all (node, relation) pairs where the relation does
+        # not hold, these are processed in bulk, skipping those which were
+        # resolved by earlier expansions and merges in the same batch. The
+        # algorithm terminates when a sweep finds no such pairs.
+        relations = self.presn.relations
+        expansions = 0
+        while True:
+            pairs = relation_sweep(self.nodes, self.edges, relations)
+            if len(pairs) == 0:
+                break
+            for node, index in pairs:
+                if not self._is_active(node):
+                    continue
+                word1, word2 = relations[index]
+                if self.path(node, word1) == self.path(node, word2):
+                    continue
+                if budget is not None and expansions == budget:
+                    return
+                self.elementary_expansion(node, word1, word2)
+                expansions += 1
+                self._process_coincidences(index)
+                if until is not None and until():
+                    return
+        self._finish()
+
+    def _query(self, predicate: Callable[[], bool]) -> Optional[bool]:
+        # Returns the value of <predicate> once the algorithm has finished,
+        # where <predicate> must be True for the finished graph if it is True
+        # for some intermediate graph. Every step of the algorithm is a
+        # homomorphism, so this holds for the existence of paths and for
+        # paths having equal end points. In incremental mode, True is returned
+        # as soon as <predicate> holds. If the budget runs out before the
+        # answer is known, then None is returned.
+        until = predicate if self.incremental else None
+        self.run(until, self.budget)
+        if predicate():
+            return True
+        return False if self._is_finished() else None
+
+    def _equal_to(self, word: List[int]) -> Optional[bool]:
+        return self._query(
+            lambda: self.path(0, word) == self.path(0, self.rep)
+        )
 
-    def equal_to(self, word: str) -> bool:
+    def equal_to(self, word: str) -> Optional[bool]:
         """
         Returns ``True`` if the argument is equal to the word used to construct
         this instance, and ``False`` if it does not.
 
+        If this instance was constructed with ``incremental=True``, then
+        ``True`` is returned as soon as the paths labelled by ``word`` and the
+        representative end at the same node, before the algorithm finishes.
+        If the ``budget`` given at construction runs out before the answer is
+        known, then ``None`` is returned, and calling this method again
+        continues from where it stopped.
+
         :param word: the word.
-        :returns: a ``bool``.
+        :returns: a ``bool``, or ``None``.
 
         .. warning::
             The procedure implemented by method may never terminate. In
@@ -145,8 +439,108 @@ class WordGraph:
             subgraph is finite, there is no bound on the run time of this
             method.
         """
-        self.run()
-        return self.path(0, self.presn.word(word)) == self.path(0, self.rep)
+        return self._equal_to(self._word(word))
+
+    async def equal_to_async(
+        self,
+        word: str,
+        timeout: Optional[float] = None,
+        pool: Optional[QueryPool] = None,
+    ) -> Optional[bool]:
+        """
+        Returns the same value as :py:meth:`equal_to` but runs the algorithm,
+        on a copy of this instance, in a separate process which is terminated
+        if the awaiting task is cancelled or ``timeout`` seconds pass.
+
+        :param word: the word.
+        :param timeout:
+          the deadline in seconds, or ``None`` for no deadline (default:
+          ``None``).
+        :param pool:
+          the :py:class:`step_hen.aio.QueryPool` limiting the number of
+          concurrent processes, or ``None`` for no limit (default: ``None``).
+        :returns: a ``bool``, or ``None`` if the deadline passed.
+        """
+        return await run_in_process(
+            self, "equal_to", word, timeout=timeout, pool=pool
+        )
+
+    def freeze(self) -> FrozenWordGraph:
+        """
+        Runs the algorithm to completion, and returns an immutable copy of the
+        graph whose edges are stored in shared memory, see
+        :py:class:`step_hen.frozen.FrozenWordGraph`.
+
+        This instance is not modified by the frozen copy, nor the frozen copy
+        by this instance.
+
+        :returns: A :py:class:`step_hen.frozen.FrozenWordGraph`.
+
+        .. warning::
+            This method does not terminate if :py:meth:`run` does not.
+        """
+        return FrozenWordGraph(self)
+
+    def snapshot(self) -> "WordGraph":
+        """
+        Returns a copy of this graph, which can be modified (for example, by
+        adding relations, or running the algorithm) independently of this
+        graph.
+
+        If the edges are stored using ``storage="cow"``, then the copy shares
+        the edges with this graph, and only the chunks of edges modified by
+        either graph are copied, see :py:class:`step_hen.edges.CowEdgeTable`.
+        Otherwise, the edges are copied. The copy has its own copy of the
+        presentation.
+
+        :returns: A graph of the same type as this.
+        """
+        result = copy.copy(self)
+        if isinstance(self.edges, CowEdgeTable):
+            result.edges = self.edges.snapshot()
+        else:
+            result.edges = copy.deepcopy(self.edges)
+        if self.simplification is not None:
+            result.simplification = copy.deepcopy(self.simplification)
+            result.presn = result.simplification.presn
+        else:
+            result.presn = copy.deepcopy(self.presn)
+        result.monitor = copy.deepcopy(self.monitor)
+        result.nodes = list(self.nodes)
+        result.kappa = list(self.kappa)
+        return result
+
+    def add_relation(self, word1: str, word2: str) -> None:
+        """
+        Add a relation to the presentation of this graph, see
+        :py:meth:`step_hen.presentation.MonoidPresentation.add_relation`.
+
+        The presentation given at construction is not modified. The first
+        call to this method replaces the presentation of this graph by a copy,
+        so that the relation is not added to any other object using the same
+        presentation.
+
+        Adding a relation can only identify elements, and so the current
+        graph, whether or not :py:meth:`run` has completed, is a valid
+        starting point for the new presentation. The next call to
+        :py:meth:`run` (or :py:meth:`equal_to`) continues from the current
+        graph rather than starting again.
+
+        :param word1: the left hand side of the relation to add.
+        :param word2: the right hand side of the relation to add.
+        :returns: ``None``.
+        """
+        if not self._owns_presn:
+            if self.simplification is not None:
+                self.simplification = copy.deepcopy(self.simplification)
+                self.presn = self.simplification.presn
+            else:
+                self.presn = copy.deepcopy(self.presn)
+            self._owns_presn = True
+        if self.simplification is not None:
+            word1 = self.simplification.to_simplified(word1)
+            word2 = self.simplification.to_simplified(word2)
+        self.presn.add_relation(word1, word2)
 
     def elementary_expansion(
         self, node: int, word1: List[int], word2: List[int]
@@ -166,27 +560,47 @@ class WordGraph:
                 node, word2, word1
             )
 
+    def _merge_sparse_edges(self, node1: int, node2: int) -> None:
+        # The part of merge_nodes which moves the edges of node2 to node1,
+        # visiting only the defined edges of node2 and the edges into node2.
+        edges1 = self.edges[node1]
+        for letter, target in list(self.edges[node2].items()):
+            if edges1[letter] is None:
+                edges1[letter] = target
+            else:
+                self.kappa.append((edges1[letter], target))
+        for node, letter in self.edges.incoming(node2):
+            if self._is_active(node):
+                self.edges[node][letter] = node1
+
     def merge_nodes(self, node1: int, node2: int) -> None:
         """
         Merge the nodes ``node1`` and ``node2``.
         """
         if node1 == node2:
             return
+        self._finished = False
         if node1 > node2:
             node1, node2 = node2, node1
 
-        for letter in range(len(self.presn.alphabet)):
-            if self.path(node2, letter) is not None:
-                if self.path(node1, letter) is None:
-                    self.edges[node1][letter] = self.path(node2, letter)
-                else:
-                    self.kappa.append(
-                        (self.path(node1, letter), self.path(node2, letter))
-                    )
-        for node in self.nodes:
+        if isinstance(self.edges, SparseEdgeTable):
+            self._merge_sparse_edges(node1, node2)
+        else:
             for letter in range(len(self.presn.alphabet)):
-                if self.path(node, letter) == node2:
-                    self.edges[node][letter] = node1
+                if self.path(node2, letter) is not None:
+                    if self.path(node1, letter) is None:
+                        self.edges[node1][letter] = self.path(node2, letter)
+                    else:
+                        self.kappa.append(
+                            (
+                                self.path(node1, letter),
+                                self.path(node2, letter),
+                            )
+                        )
+            for node in self.nodes:
+                for letter in range(len(self.presn.alphabet)):
+                    if self.path(node, letter) == node2:
+                        self.edges[node][letter] = node1
         self.kappa = [
             [node1, l] if k == node2 else [k, l] for k, l in self.kappa
         ]
@@ -0,0 +1,18 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2021, J. D. Mitchell + Maria Tsalakou
+#
+# Distributed under the terms of the GPL license version 3.
+#
+# The full license is in the file LICENSE, distributed with this software.
+
+from step_hen import InverseMonoidPresentation
+
+
+def bicyclic():
+    # Returns a presentation for the bicyclic monoid, which is infinite, so
+    # that Stephen's procedure never terminates for it.
+    P = InverseMonoidPresentation()
+    P.set_alphabet("x")
+    P.add_relation("xX", "")
+    return P
@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2021, J. D. Mitchell + Maria Tsalakou
+#
+# Distributed under the terms of the GPL license version 3.
+#
+# The full license is in the file LICENSE, distributed with this software.
+
+import asyncio
+import unittest
+from step_hen import (
+    InverseMonoidPresentation,
+    MonoidPresentation,
+    SchutzenbergerGraph,
+    Stephen,
+    WordGraph,
+)
+from step_hen.aio import QueryPool
+from tests import bicyclic
+
+
+def _run(coro):
+    # asyncio.run was added in Python 3.7
+    if hasattr(asyncio, "run"):
+        return asyncio.run(coro)
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coro)
+    finally:
+        loop.close()
+
+
+class TestAsync(unittest.TestCase):
+    def test_001(self):
+        P = MonoidPresentation()
+        P.set_alphabet("ab")
+        P.add_relation("aaa", "a")
+        P.add_relation("bbb", "b")
+        P.add_relation("abab", "aa")
+
+        S = WordGraph(P, "bbab")
+        self.assertTrue(_run(S.equal_to_async("bbaaba", timeout=10)))
+        self.assertFalse(_run(S.equal_to_async("bbb")))
+        # The copy in the other process was run, but not this one
+        self.assertEqual(S.number_of_nodes(), 5)
+
+    def test_002(self):
+        S = SchutzenbergerGraph(bicyclic(), "X")
+        self.assertIsNone(_run(S.accepts_async("X", timeout=0.5)))
+
+    def test_003(self):
+        P = InverseMonoidPresentation()
+        P.set_alphabet("xy")
+        P.add_relation("xxx", "x")
+        P.add_relation("yyyyy", "y")
+        P.add_relation("xyxy", "xx")
+
+        async def queries():
+            pool = QueryPool(2)
+            return await asyncio.gather(
+                Stephen(P).size_async(pool=pool),
+                Stephen(bicyclic()).size_async(timeout=0.5, pool=pool),
+                SchutzenbergerGraph(P, "xy").accepts_async("xyyY", pool=pool),
+            )
+
+        self.assertEqual(_run(queries()), [13, None, True])
+
+    def test_004(self):
+        async def cancelled():
+            task = asyncio.ensure_future(Stephen(bicyclic()).size_async())
+            await asyncio.sleep(0.2)
+            task.cancel()
+            await task
+
+        with self.assertRaises(asyncio.CancelledError):
+            _run(cancelled())
+
+    def test_005(self):
+        P = MonoidPresentation()
+        P.set_alphabet("ab")
+        P.add_relation("aaa", "a")
+        P.add_relation("bbb", "b")
+        P.add_relation("abab", "aa")
+        pool = QueryPool(1)
+
+        async def queries():
+            return await asyncio.gather(
+                WordGraph(P, "bbab").equal_to_async("bbaaba", pool=pool),
+                WordGraph(P, "bbab").equal_to_async("bbb", pool=pool),
+            )
+
+        # The same pool is used from two different event loops
+        self.assertEqual(_run(queries()), [True, False])
+        self.assertEqual(_run(queries()), [True, False])
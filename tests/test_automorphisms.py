@@ -0,0 +1,40 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2021, J. D. Mitchell + Maria Tsalakou
+#
+# Distributed under the terms of the GPL license version 3.
+#
+# The full license is in the file LICENSE, distributed with this software.
+
+import unittest
+from step_hen import InverseMonoidPresentation
+from step_hen.automorphisms import (
+    automorphisms,
+    closure,
+    extend,
+    is_automorphism,
+)
+
+
+class TestAutomorphisms(unittest.TestCase):
+    def test_001(self):
+        P = InverseMonoidPresentation()
+        P.set_alphabet("xyz")
+        P.add_relation("xxx", "x")
+        P.add_relation("yyy", "y")
+        P.add_relation("zzzzz", "z")
+        P.add_relation("xy", "yx")
+
+        self.assertEqual(extend(P, [1, 0, 2]), [1, 0, 2, 4, 3, 5])
+        self.assertTrue(is_automorphism(P, [1, 0, 2]))
+        self.assertFalse(is_automorphism(P, [0, 2, 1]))
+        self.assertFalse(is_automorphism(P, [0, 0, 1]))
+        self.assertEqual(automorphisms(P), [[0, 1, 2], [1, 0, 2]])
+        self.assertEqual(automorphisms(P, 1), [[0, 1, 2]])
+
+    def test_002(self):
+        self.assertEqual(closure([]), [])
+        self.assertEqual(len(closure([[1, 2, 3, 0], [1, 0, 2, 3]])), 24)
+        self.assertEqual(
+            closure([[1, 2, 0]]), [[0, 1, 2], [1, 2, 0], [2, 0, 1]]
+        )
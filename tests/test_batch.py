@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2021, J. D. Mitchell + Maria Tsalakou
+#
+# Distributed under the terms of the GPL license version 3.
+#
+# The full license is in the file LICENSE, distributed with this software.
+
+import json
+import os
+import tempfile
+import unittest
+from step_hen import InverseMonoidPresentation
+from step_hen.batch import normalise, run_batch
+
+
+def presentation(relations, alphabet="xy"):
+    P = InverseMonoidPresentation()
+    P.set_alphabet(alphabet)
+    for word1, word2 in relations:
+        P.add_relation(word1, word2)
+    return P
+
+
+class TestBatch(unittest.TestCase):
+    def setUp(self):
+        handle, self.path = tempfile.mkstemp(suffix=".jsonl")
+        os.close(handle)
+
+    def tearDown(self):
+        os.remove(self.path)
+
+    def test_001(self):
+        P = presentation([("xxx", "x"), ("yyyyy", "y"), ("xyxy", "xx")])
+        Q = presentation(
+            [("xx", "xyxy"), ("x", "xxx"), ("yyyyy", "y"), ("x", "x")]
+        )
+        R = presentation([("xxx", "x"), ("yyyyy", "y")])
+        self.assertEqual(normalise(P), normalise(Q))
+        self.assertNotEqual(normalise(P), normalise(R))
+        self.assertNotEqual(
+            normalise(P),
+            normalise(presentation([("xxx", "x"), ("yyyyy", "y")], "xyz")),
+        )
+
+    def test_002(self):
+        presentations = [
+            presentation([("xxx", "x"), ("yyyyy", "y"), ("xyxy", "xx")]),
+            presentation([("xx", "x"), ("yy", "y"), ("xy", "yx")]),
+            presentation([("xx", "xyxy"), ("x", "xxx"), ("yyyyy", "y")]),
+            presentation([("xX", "")], "x"),
+        ]
+        records = sorted(
+            run_batch(presentations, self.path, max_workers=2, timeout=1),
+            key=lambda x: x["index"],
+        )
+        self.assertEqual([x["index"] for x in records], [0, 1, 2, 3])
+        self.assertEqual(
+            [x["status"] for x in records], ["ok", "ok", "ok", "timeout"]
+        )
+        self.assertEqual([x["size"] for x in records[:3]], [13, 4, 13])
+        self.assertEqual([x["r_classes"] for x in records[:3]], [3, 4, 3])
+        self.assertEqual([x["cached"] for x in records[:3]].count(True), 1)
+        with open(self.path, "r", encoding="utf-8") as file:
+            self.assertEqual(len([json.loads(line) for line in file]), 3)
+
+        # Resuming only retries the presentation which timed out
+        records = list(run_batch(presentations[:3], self.path, timeout=1))
+        self.assertTrue(all(x["cached"] for x in records))
+        records = list(run_batch(presentations[3:], self.path, timeout=0.1))
+        self.assertEqual(records[0]["status"], "timeout")
+        self.assertFalse(records[0]["cached"])
+
+    def test_003(self):
+        P = presentation([("xx", "x"), ("yy", "y"), ("xy", "yx")])
+        records = list(
+            run_batch([P], self.path, options={"automorphisms": [[0, 0]]})
+        )
+        self.assertEqual(records[0]["status"], "error")
+        self.assertIn("ValueError", records[0]["error"])
+        records = list(
+            run_batch([P], self.path, options={"automorphisms": True})
+        )
+        self.assertEqual(records[0]["status"], "ok")
+
+    def test_004(self):
+        P = presentation([("xx", "x"), ("yy", "y"), ("xy", "yx")])
+        # A final line which was only partly written
+        with open(self.path, "w", encoding="utf-8") as file:
+            file.write('{"key": "abc", "sta')
+        records = list(run_batch([P], self.path))
+        self.assertEqual(records[0]["status"], "ok")
+        self.assertFalse(records[0]["cached"])
+        with open(self.path, "r", encoding="utf-8") as file:
+            lines = file.read().splitlines()
+        self.assertEqual(lines[0], '{"key": "abc", "sta')
+        self.assertEqual(json.loads(lines[1])["status"], "ok")
+        records = list(run_batch([P], self.path))
+        self.assertTrue(records[0]["cached"])
+        self.assertEqual(records[0]["size"], 4)
@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2021, J. D. Mitchell + Maria Tsalakou
+#
+# Distributed under the terms of the GPL license version 3.
+#
+# The full license is in the file LICENSE, distributed with this software.
+
+import unittest
+from step_hen import (
+    InverseMonoidPresentation,
+    SchutzenbergerGraph,
+    Stephen,
+    WordGraph,
+)
+from step_hen.aio import ProcessJob
+from step_hen.divergence import DivergenceMonitor, ProbablyInfiniteError
+from tests import bicyclic
+
+
+class TestDivergence(unittest.TestCase):
+    def test_001(self):
+        M = DivergenceMonitor(window=10, max_period=3, repeats=4)
+        for i in range(10):
+            M.observe(i, False, i)
+        with self.assertRaises(ProbablyInfiniteError) as cm:
+            M.observe(10, False, 10)
+        self.assertEqual(cm.exception.evidence["size"], 10)
+        self.assertEqual(cm.exception.evidence["initial_size"], 0)
+
+        M.reset()
+        for i in range(100):
+            M.observe(i % 7, i % 5 == 0, i)
+
+        M = M.copy()
+        with self.assertRaises(ProbablyInfiniteError) as cm:
+            for i in range(100):
+                M.observe(i // 2, i % 2 == 0, "ab"[i % 2])
+        self.assertEqual(cm.exception.evidence["period"], 2)
+        self.assertEqual(cm.exception.evidence["pattern"], ["a", "b"])
+        self.assertEqual(cm.exception.evidence["growth_per_period"], 1)
+
+        with self.assertRaises(ValueError):
+            DivergenceMonitor(repeats=1)
+
+    def test_002(self):
+        S = SchutzenbergerGraph(bicyclic(), "X", monitor=DivergenceMonitor())
+        with self.assertRaises(ProbablyInfiniteError):
+            S.run()
+
+        S = Stephen(bicyclic(), monitor=DivergenceMonitor())
+        with self.assertRaises(ProbablyInfiniteError):
+            S.size()
+
+    def test_003(self):
+        P = InverseMonoidPresentation()
+        P.set_alphabet("xy")
+        P.add_relation("xxx", "x")
+        P.add_relation("yyyyy", "y")
+        P.add_relation("xyxy", "xx")
+
+        S = Stephen(P, monitor=DivergenceMonitor(window=100))
+        self.assertEqual(S.size(), 13)
+        S = WordGraph(P, "xyXyy", monitor=DivergenceMonitor(window=100))
+        self.assertTrue(S.equal_to("xyXyy"))
+
+    def test_004(self):
+        S = Stephen(bicyclic(), monitor=DivergenceMonitor())
+        job = ProcessJob(S, "size")
+        job.connection().poll(60)
+        self.assertTrue(job.done())
+        with self.assertRaises(ProbablyInfiniteError) as cm:
+            job.result()
+        self.assertEqual(cm.exception.evidence["period"], 1)
+        self.assertEqual(cm.exception.evidence["pattern"], [0])
@@ -0,0 +1,221 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2021, J. D. Mitchell + Maria Tsalakou
+#
+# Distributed under the terms of the GPL license version 3.
+#
+# The full license is in the file LICENSE, distributed with this software.
+
+import copy
+import pickle
+import tempfile
+import unittest
+from step_hen import (
+    InverseMonoidPresentation,
+    MonoidPresentation,
+    SchutzenbergerGraph,
+    WordGraph,
+)
+from step_hen.edges import (
+    SPARSE_DEGREE,
+    CowEdgeTable,
+    MmapEdgeTable,
+    SparseEdgeTable,
+    edge_table,
+)
+
+
+class TestMmapEdgeTable(unittest.TestCase):
+    def test_001(self):
+        E = MmapEdgeTable(3, chunk=2)
+        self.assertEqual(len(E), 0)
+        for i in range(5):
+            E.append([None, i, None])
+        E[4][0] = 1
+        self.assertEqual(len(E), 5)
+        self.assertEqual(E[3][1], 3)
+        self.assertEqual(E[4], [1, 4, None])
+        self.assertEqual(E[0][0], None)
+        self.assertEqual(
+            E,
+            [
+                [None, 0, None],
+                [None, 1, None],
+                [None, 2, None],
+                [None, 3, None],
+                [1, 4, None],
+            ],
+        )
+        with self.assertRaises(IndexError):
+            E[5]  # pylint: disable=pointless-statement
+        E.close()
+
+    def test_002(self):
+        with self.assertRaises(ValueError):
+            edge_table("heap", 2)
+        self.assertEqual(edge_table("list", 2), [])
+
+    def test_003(self):
+        P = MonoidPresentation()
+        P.set_alphabet("ab")
+        P.add_relation("aaa", "a")
+        P.add_relation("bbb", "b")
+        P.add_relation("abab", "aa")
+
+        S = WordGraph(P, "bbab", storage="mmap")
+        self.assertTrue(S.equal_to("bbaaba"))
+        self.assertFalse(S.equal_to("bbb"))
+
+    def test_004(self):
+        P = InverseMonoidPresentation()
+        P.set_alphabet("abc")
+        P.add_relation("ac", "ca")
+        P.add_relation("ab", "ba")
+        P.add_relation("bc", "cb")
+
+        S = SchutzenbergerGraph(P, "BaAbaBcAbC", storage="mmap")
+        T = SchutzenbergerGraph(P, "BaAbaBcAbC")
+        S.run()
+        T.run()
+        self.assertEqual(S.nodes, T.nodes)
+        self.assertEqual(S.edges, T.edges)
+
+    def test_005(self):
+        E = SparseEdgeTable(300)
+        E.append([None] * 300)
+        E.add_row()
+        E[0][299] = 1
+        E[1][0] = 0
+        self.assertEqual(E[0][299], 1)
+        self.assertEqual(E[0][298], None)
+        self.assertEqual(list(E[1].items()), [(0, 0)])
+        E[1][0] = None
+        self.assertEqual(list(E[1].items()), [])
+        self.assertEqual(len(E[1]), 300)
+        self.assertEqual(E.tolist()[0][299], 1)
+
+    def test_006(self):
+        self.assertEqual(edge_table(None, SPARSE_DEGREE), [])
+        self.assertIsInstance(
+            edge_table(None, SPARSE_DEGREE + 1), SparseEdgeTable
+        )
+
+    def test_007(self):
+        P = InverseMonoidPresentation()
+        P.set_alphabet(150)
+        for i in range(150):
+            P.add_relation([i, i, i], [i])
+        P.add_relation([0, 1], [1, 0])
+
+        S = SchutzenbergerGraph(P, [0, 1, 0])
+        self.assertIsInstance(S.edges, SparseEdgeTable)
+        self.assertTrue(S.accepts([1, 0, 0]))
+        self.assertTrue(S.accepts([0, 0, 1]))
+        self.assertFalse(S.accepts([1, 0]))
+        T = SchutzenbergerGraph(P, [0, 1, 0], storage="list")
+        T.run()
+        self.assertEqual(S.number_of_nodes(), T.number_of_nodes())
+        self.assertEqual(S.edges, T.edges)
+
+    def test_008(self):
+        E = CowEdgeTable(2, chunk=2)
+        for i in range(5):
+            E.append([i, None])
+        self.assertEqual(E.number_of_owned_chunks(), 3)
+        F = E.snapshot()
+        self.assertEqual(E.number_of_owned_chunks(), 0)
+        self.assertEqual(F, E)
+        F[3][1] = 0
+        F.append([1, 1])
+        E[0][0] = None
+        self.assertEqual(
+            E.tolist(),
+            [[None, None], [1, None], [2, None], [3, None], [4, None]],
+        )
+        self.assertEqual(
+            F.tolist(),
+            [[0, None], [1, None], [2, None], [3, 0], [4, None], [1, 1]],
+        )
+        self.assertEqual(E.number_of_owned_chunks(), 1)
+        self.assertEqual(F.number_of_owned_chunks(), 2)
+
+    def test_009(self):
+        P = MonoidPresentation()
+        P.set_alphabet("ab")
+        P.add_relation("aaa", "a")
+        P.add_relation("bbb", "b")
+
+        S = WordGraph(P, "bbab", storage="cow")
+        self.assertFalse(S.equal_to("bbaaba"))
+        T = S.snapshot()
+        self.assertEqual(T.edges.number_of_owned_chunks(), 0)
+        T.add_relation("abab", "aa")
+        self.assertTrue(T.equal_to("bbaaba"))
+        self.assertFalse(S.equal_to("bbaaba"))
+        self.assertEqual(len(P.relations), 2)
+        U = WordGraph(P, "bbab")
+        U.run()
+        self.assertEqual(S.edges, U.edges)
+
+        U = WordGraph(P, "bbab").snapshot()
+        U.add_relation("abab", "aa")
+        self.assertTrue(U.equal_to("bbaaba"))
+        self.assertEqual(len(P.relations), 2)
+
+    def test_010(self):
+        P = MonoidPresentation()
+        P.set_alphabet("ab")
+        P.add_relation("aaa", "a")
+        P.add_relation("bbb", "b")
+        P.add_relation("abab", "aa")
+
+        with tempfile.TemporaryDirectory() as directory:
+            options = {"directory": directory, "chunk": 2}
+            S = WordGraph(P, "bbab", storage="mmap", storage_options=options)
+            S.run()
+            for T in (
+                S.snapshot(),
+                copy.deepcopy(S),
+                pickle.loads(pickle.dumps(S)),
+            ):
+                self.assertIsInstance(T.edges, MmapEdgeTable)
+                self.assertEqual(T.edges, S.edges)
+                self.assertTrue(T.equal_to("bbaaba"))
+                T.edges[0][0] = 5
+                self.assertNotEqual(T.edges, S.edges)
+                T.edges.close()
+            S.edges.close()
+
+        with self.assertRaises(ValueError):
+            WordGraph(P, "a", storage="list", storage_options=options)
+
+    def test_011(self):
+        E = SparseEdgeTable(300)
+        for _ in range(3):
+            E.add_row()
+        E[0][5] = 2
+        E[1][299] = 2
+        E[2][0] = 0
+        self.assertEqual(sorted(E.incoming(2)), [(0, 5), (1, 299)])
+        E[1][299] = 0
+        self.assertEqual(E.incoming(2), [(0, 5)])
+        self.assertEqual(sorted(E.incoming(0)), [(1, 299), (2, 0)])
+        E[2][0] = None
+        self.assertEqual(E.incoming(0), [(1, 299)])
+
+        P = InverseMonoidPresentation()
+        P.set_alphabet(150)
+        for i in range(150):
+            P.add_relation([i, i, i], [i])
+        for i in range(149):
+            P.add_relation([i, i + 1], [i + 1, i])
+
+        S = SchutzenbergerGraph(P, [3, 2, 1, 0, 4])
+        T = SchutzenbergerGraph(P, [3, 2, 1, 0, 4], storage="list")
+        S.run()
+        T.run()
+        self.assertEqual(S.nodes, T.nodes)
+        self.assertEqual(S.edges, T.edges)
+        perm = list(range(299, -1, -1))
+        self.assertEqual(S.canonical_form(3, perm), T.canonical_form(3, perm))
+        self.assertEqual(S.fingerprint(3, perm), T.fingerprint(3, perm))
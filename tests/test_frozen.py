@@ -0,0 +1,132 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2021, J. D. Mitchell + Maria Tsalakou
+#
+# Distributed under the terms of the GPL license version 3.
+#
+# The full license is in the file LICENSE, distributed with this software.
+
+import gc
+import multiprocessing
+import os
+import pickle
+import subprocess
+import sys
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from step_hen import (
+    InverseMonoidPresentation,
+    MonoidPresentation,
+    SchutzenbergerGraph,
+    WordGraph,
+)
+from step_hen.frozen import shared_memory
+
+
+def _accepts(frozen, words):
+    with frozen:
+        return [frozen.accepts(word) for word in words]
+
+
+@unittest.skipIf(shared_memory is None, "shared_memory is not available")
+class TestFrozen(unittest.TestCase):
+    def test_001(self):
+        P = MonoidPresentation()
+        P.set_alphabet("ab")
+        P.add_relation("aa", "a")
+        P.add_relation("ab", "b")
+
+        S = WordGraph(P, "ab")
+        with S.freeze() as F:
+            self.assertEqual(F.number_of_nodes(), S.number_of_nodes())
+            self.assertTrue(F.equal_to("b"))
+            self.assertTrue(F.equal_to("aab"))
+            self.assertFalse(F.equal_to("a"))
+            self.assertEqual(F.path(0, P.word("ab")), F.path(0, P.word("b")))
+
+    def test_002(self):
+        P = InverseMonoidPresentation()
+        P.set_alphabet("xy")
+
+        S = SchutzenbergerGraph(P, "xxxyyy")
+        words = ["xxxyyyYYYXXXxxxyyy", "xxxyyyYy", "xXxxxyyy"]
+        with S.freeze() as F:
+            self.assertEqual([F.accepts(word) for word in words], [True] * 3)
+            self.assertIn("xxxyyyYYY", F)
+            self.assertNotIn("y", F)
+            self.assertFalse(F.accepts("xxxyyyy"))
+            with ThreadPoolExecutor(4) as executor:
+                self.assertEqual(
+                    list(executor.map(F.accepts, words * 10)), [True] * 30
+                )
+
+    def test_003(self):
+        P = InverseMonoidPresentation()
+        P.set_alphabet("xy")
+        P.add_relation("xyXxyX", "xyX")
+
+        S = SchutzenbergerGraph(P, "xyXyy")
+        words = ["xyyyXyy", "xXyx", "xXxx"]
+        with S.freeze() as F:
+            G = pickle.loads(pickle.dumps(F))
+            self.assertEqual(G.name, F.name)
+            self.assertEqual([G.accepts(word) for word in words], [1, 0, 0])
+            G.close()
+            process = multiprocessing.get_context()
+            with process.Pool(2) as pool:
+                self.assertEqual(
+                    pool.starmap(_accepts, [(F, words)] * 2),
+                    [[True, False, False]] * 2,
+                )
+
+    def test_004(self):
+        P = MonoidPresentation()
+        P.set_alphabet("ab")
+        P.add_relation("aa", "a")
+        P.add_relation("ab", "b")
+
+        errors = []
+        hook, sys.unraisablehook = sys.unraisablehook, errors.append
+        try:
+            F = WordGraph(P, "ab").freeze()
+            G = pickle.loads(pickle.dumps(F))
+            self.assertTrue(G.equal_to("aab"))
+            del G
+            F.unlink()
+            del F
+            gc.collect()
+        finally:
+            sys.unraisablehook = hook
+        self.assertEqual(errors, [])
+
+    def test_005(self):
+        P = MonoidPresentation()
+        P.set_alphabet("ab")
+        P.add_relation("aa", "a")
+        P.add_relation("ab", "b")
+
+        script = (
+            "import pickle, sys\n"
+            "F = pickle.loads(sys.stdin.buffer.read())\n"
+            "print(F.equal_to('aab'), F.equal_to('a'))\n"
+            "F.close()\n"
+        )
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        env = dict(os.environ, PYTHONPATH=root)
+        with WordGraph(P, "ab").freeze() as F:
+            data = pickle.dumps(F)
+            for _ in range(2):
+                result = subprocess.run(
+                    [sys.executable, "-c", script],
+                    input=data,
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.PIPE,
+                    env=env,
+                    check=True,
+                )
+                self.assertEqual(result.stdout.split(), [b"True", b"False"])
+                self.assertEqual(result.stderr, b"")
+            # The segment outlives the processes which attached to it.
+            G = pickle.loads(data)
+            self.assertTrue(G.equal_to("aab"))
+            G.close()
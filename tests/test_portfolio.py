@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2021, J. D. Mitchell + Maria Tsalakou
+#
+# Distributed under the terms of the GPL license version 3.
+#
+# The full license is in the file LICENSE, distributed with this software.
+
+import time
+import unittest
+from step_hen import InverseMonoidPresentation, MonoidPresentation
+from step_hen import portfolio
+from tests import bicyclic
+
+
+class TestPortfolio(unittest.TestCase):
+    def test_001(self):
+        P = MonoidPresentation()
+        P.set_alphabet("ab")
+        P.add_relation("aaa", "a")
+        P.add_relation("bbb", "b")
+        P.add_relation("abab", "aa")
+
+        self.assertTrue(portfolio.equal_to(P, "bbab", "bbaaba"))
+        self.assertFalse(portfolio.equal_to(P, "bbab", "bbb"))
+
+        P = InverseMonoidPresentation()
+        P.set_alphabet("xy")
+        P.add_relation("xxx", "x")
+        P.add_relation("yyyyy", "y")
+        P.add_relation("xyxy", "xx")
+        self.assertEqual(portfolio.size(P), 13)
+        self.assertTrue(portfolio.accepts(P, "xxxyyy", "xxxyyyYYYXXXxxxyyy"))
+
+    def test_002(self):
+        # Only the incremental configurations terminate
+        P = bicyclic()
+        start = time.monotonic()
+        self.assertTrue(portfolio.accepts(P, "X", "xXX", timeout=10))
+        self.assertLess(time.monotonic() - start, 10)
+        self.assertIsNone(
+            portfolio.accepts(P, "X", "x", configs=[{}], timeout=0.1)
+        )
+        self.assertIsNone(portfolio.size(P, timeout=0.1))
+
+    def test_003(self):
+        P = bicyclic()
+        with self.assertRaises(ValueError):
+            portfolio.race([(P, "add_relation", ("y", "x"))])
+        self.assertIsNone(
+            portfolio.race(
+                [
+                    (P, "add_relation", ("x", "x")),
+                    (P, "add_relation", ("", "")),
+                ]
+            )
+        )
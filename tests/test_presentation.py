@@ -25,9 +25,33 @@ class TestPresentations(unittest.TestCase):
     def test_002(self):
         P = MonoidPresentation()
         with self.assertRaises(TypeError):
-            P.set_alphabet(3)
+            P.set_alphabet(3.0)
         with self.assertRaises(ValueError):
             P.set_alphabet("aaa")
         P.set_alphabet("abc")
         with self.assertRaises(ValueError):
             P.set_alphabet("abc")
+
+    def test_003(self):
+        P = MonoidPresentation()
+        with self.assertRaises(ValueError):
+            P.set_alphabet(-1)
+        P.set_alphabet(300)
+        with self.assertRaises(ValueError):
+            P.set_alphabet(3)
+        P.add_relation([0, 299], [299])
+        with self.assertRaises(TypeError):
+            P.add_relation("ab", [299])
+        with self.assertRaises(ValueError):
+            P.add_relation([300], [])
+        self.assertEqual(P.relations, [([0, 299], [299])])
+        self.assertEqual(P.string([3, 2, 1]), [3, 2, 1])
+
+    def test_004(self):
+        P = InverseMonoidPresentation()
+        P.set_alphabet(100)
+        self.assertEqual(len(P.alphabet), 200)
+        self.assertEqual(P.inverse(0), 100)
+        self.assertEqual(P.inverse(199), 99)
+        P.add_relation([0, 1], [1, 0])
+        self.assertEqual(P.relations, [([0, 1], [1, 0])])
@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2021, J. D. Mitchell + Maria Tsalakou
+#
+# Distributed under the terms of the GPL license version 3.
+#
+# The full license is in the file LICENSE, distributed with this software.
+
+import unittest
+from step_hen import (
+    InverseMonoidPresentation,
+    SchutzenbergerGraph,
+    SchutzenbergerGraphRegistry,
+)
+
+
+class TestSchutzenbergerGraphRegistry(unittest.TestCase):
+    def test_001(self):
+        P = InverseMonoidPresentation()
+        P.set_alphabet("xy")
+        P.add_relation("xxx", "x")
+        P.add_relation("yyyyy", "y")
+        P.add_relation("xyxy", "xx")
+
+        R = SchutzenbergerGraphRegistry(P)
+        S = R.schutzenberger_graph("xy")
+        self.assertEqual(R.number_of_graphs(), 1)
+        # xyy has xy as a prefix and labels a path in S(xy)
+        T = R.schutzenberger_graph("xyy")
+        self.assertEqual(R.number_of_graphs(), 1)
+        self.assertEqual(T.edges, S.edges)
+        self.assertIsNot(T.edges, S.edges)
+        for w in ("xy", "xyy", "xyyy", "xyyxyyY"):
+            self.assertEqual(
+                T.accepts(w), SchutzenbergerGraph(P, "xyy").accepts(w)
+            )
+
+        R.schutzenberger_graph("y")
+        R.schutzenberger_graph("")
+        self.assertEqual(R.number_of_graphs(), 3)
+
+    def test_002(self):
+        P = InverseMonoidPresentation()
+        P.set_alphabet("abc")
+        P.add_relation("ac", "ca")
+        P.add_relation("ab", "ba")
+        P.add_relation("bc", "cb")
+
+        R = SchutzenbergerGraphRegistry(P)
+        self.assertTrue(R.equal("aBcAbC", "aBcCbBcAbC"))
+        self.assertTrue(R.equal("aBcCbBcAbC", "aBcAbC"))
+        self.assertFalse(R.equal("aBcAbC", "BaAbaBcAbC"))
+        self.assertTrue(R.equal("ab", "ba"))
+        self.assertFalse(R.equal("a", "aA"))
+        self.assertEqual(R.number_of_graphs(), 4)
+
+    def test_003(self):
+        P = InverseMonoidPresentation()
+        P.set_alphabet("x")
+
+        R = SchutzenbergerGraphRegistry(P)
+        # x and xX are R-related, and so they share a graph
+        self.assertFalse(R.equal("xX", "x"))
+        self.assertEqual(R.number_of_graphs(), 1)
+        # X labels a path in S(xX) but is not R-related to it
+        self.assertFalse(R.equal("X", "xX"))
+        self.assertEqual(R.number_of_graphs(), 2)
+
+    def test_004(self):
+        P = InverseMonoidPresentation()
+        P.set_alphabet("xy")
+        P.add_relation("xxx", "x")
+        P.add_relation("yyyyy", "y")
+        P.add_relation("xyxy", "xx")
+
+        R = SchutzenbergerGraphRegistry(P)
+        S = R.schutzenberger_graph("xy")
+        T = R.schutzenberger_graph("xyy")
+        num_nodes = T.number_of_nodes()
+        S.add_relation("xy", "yxx")
+        S.run(budget=3)
+        # T is not affected by S
+        T.run()
+        self.assertEqual(T.number_of_nodes(), num_nodes)
+
+        P.add_relation("xy", "yxx")
+        U = SchutzenbergerGraph(P, "xyy")
+        U.run()
+        T = R.schutzenberger_graph("xyy")
+        self.assertEqual(T.number_of_nodes(), U.number_of_nodes())
+
+        P = InverseMonoidPresentation()
+        P.set_alphabet("xy")
+        P.add_relation("xxx", "x")
+        P.add_relation("yyy", "y")
+
+        R = SchutzenbergerGraphRegistry(P)
+        self.assertFalse(R.equal("x", "y"))
+        P.add_relation("x", "y")
+        self.assertTrue(R.equal("x", "y"))
+        self.assertTrue(SchutzenbergerGraph(P, "x").accepts("y"))
@@ -124,3 +124,58 @@ class TestSchutzenbergerGraph(unittest.TestCase):
                 [None, None, None, None, None, 0],
             ],
         )
+
+    def test_007(self):
+        P = InverseMonoidPresentation()
+        P.set_alphabet("xy")
+        P.add_relation("xxx", "x")
+        P.add_relation("yyyyy", "y")
+        P.add_relation("xyxy", "xx")
+
+        S = SchutzenbergerGraph(P, "xy")
+        S.run()
+        T = S.retarget("xyyY")
+        self.assertEqual(T.edges, S.edges)
+        self.assertIsNot(T.edges, S.edges)
+        self.assertEqual(T.path(0, T.rep), S.path(0, P.word("xyyY")))
+        self.assertTrue(T.accepts("xyyY"))
+        with self.assertRaises(ValueError):
+            SchutzenbergerGraph(P, "").retarget("x")
+
+    def test_008(self):
+        # The R-class of X in the bicyclic monoid is infinite
+        P = InverseMonoidPresentation()
+        P.set_alphabet("x")
+        P.add_relation("xX", "")
+
+        S = SchutzenbergerGraph(P, "X", incremental=True, budget=100)
+        self.assertTrue(S.accepts("XxX"))
+        self.assertTrue(S.accepts("xXX"))
+        self.assertTrue(S.accepts("xxXXX"))
+        self.assertTrue("xxxxx" in S)
+        self.assertIsNone(S.accepts("x"))
+        self.assertIsNone(S.accepts("XX"))
+
+        S = SchutzenbergerGraph(P, "X", budget=10)
+        self.assertIsNone(S.accepts("x"))
+
+    def test_009(self):
+        P = InverseMonoidPresentation()
+        P.set_alphabet("xy")
+        P.add_relation("xxx", "x")
+        P.add_relation("yyyyy", "y")
+        P.add_relation("xyxy", "xx")
+
+        S = SchutzenbergerGraph(P, "xy")
+        S.run()
+        for rep in ["Xxy", "yxy", "Yxy"]:
+            node = S.path(0, P.word(rep[0].swapcase()))
+            self.assertIsNotNone(node)
+            T = S.reroot(node, rep)
+            U = SchutzenbergerGraph(P, rep)
+            U.run()
+            self.assertEqual(T.canonical_form(), U.canonical_form())
+            for word in ["xy", "yxy", "xXxy", "yYxy", "YyYxy", "yxxxy"]:
+                self.assertEqual(T.accepts(word), U.accepts(word))
+            self.assertTrue(T.accepts(rep))
+            self.assertEqual(T.number_of_nodes(), S.number_of_nodes())
@@ -0,0 +1,47 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2021, J. D. Mitchell + Maria Tsalakou
+#
+# Distributed under the terms of the GPL license version 3.
+#
+# The full license is in the file LICENSE, distributed with this software.
+
+import unittest
+from step_hen import MonoidPresentation, SharedWordGraph, WordGraph
+
+
+class TestSharedWordGraph(unittest.TestCase):
+    def test_001(self):
+        P = MonoidPresentation()
+        P.set_alphabet("ab")
+        P.add_relation("aaa", "a")
+        P.add_relation("bbb", "b")
+        P.add_relation("abab", "aa")
+
+        S = SharedWordGraph(P)
+        words = ["ab", "ba", "aab", "abb", "bab", "aabb", "baba", "bbaa"]
+        for word in words:
+            S.add_word(word)
+        S.run()
+        for word1 in words:
+            for word2 in words:
+                self.assertEqual(
+                    S.equal(word1, word2), WordGraph(P, word1).equal_to(word2)
+                )
+
+    def test_002(self):
+        P = MonoidPresentation()
+        P.set_alphabet("ab")
+        P.add_relation("aa", "a")
+        P.add_relation("ab", "b")
+
+        S = SharedWordGraph(P, incremental=True)
+        self.assertTrue(S.equal("aab", "b"))
+        self.assertFalse(S.equal("ab", "ba"))
+        self.assertTrue(S.equal("aaab", "b"))
+        self.assertFalse(S.equal("b", "a"))
+        self.assertFalse(S.equal("", "a"))
+
+        S = SharedWordGraph(P, budget=0)
+        self.assertIsNone(S.equal("ab", "ba"))
+        self.assertTrue(S.equal("b", "b"))
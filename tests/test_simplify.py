@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2021, J. D. Mitchell + Maria Tsalakou
+#
+# Distributed under the terms of the GPL license version 3.
+#
+# The full license is in the file LICENSE, distributed with this software.
+
+import unittest
+from step_hen import (
+    InverseMonoidPresentation,
+    MonoidPresentation,
+    SchutzenbergerGraph,
+    SimplifiedPresentation,
+    Stephen,
+    WordGraph,
+)
+
+
+class TestSimplifiedPresentation(unittest.TestCase):
+    def test_001(self):
+        P = MonoidPresentation()
+        P.set_alphabet("ab")
+        P.add_relation("aa", "a")
+        P.add_relation("aa", "a")
+        P.add_relation("ab", "ab")
+        P.add_relation("aaa", "a")
+
+        Q = SimplifiedPresentation(P)
+        self.assertEqual(Q.presn.alphabet, "ab")
+        self.assertEqual(Q.presn.relations, [([0, 0], [0])])
+
+    def test_002(self):
+        P = MonoidPresentation()
+        P.set_alphabet("abc")
+        P.add_relation("ab", "c")
+        P.add_relation("aa", "a")
+        P.add_relation("bb", "b")
+        P.add_relation("ba", "ab")
+
+        Q = SimplifiedPresentation(P)
+        self.assertEqual(Q.presn.alphabet, "ab")
+        self.assertEqual(len(Q.presn.relations), 3)
+        self.assertEqual(Q.to_simplified("cac"), "abaab")
+        self.assertEqual(Q.to_original("ab"), "ab")
+        with self.assertRaises(ValueError):
+            Q.to_original("c")
+
+        self.assertTrue(WordGraph(P, "cc", simplify=True).equal_to("ba"))
+        self.assertTrue(WordGraph(P, "ab", simplify=True).equal_to("c"))
+        self.assertFalse(WordGraph(P, "c", simplify=True).equal_to("b"))
+
+    def test_003(self):
+        P = InverseMonoidPresentation()
+        P.set_alphabet("xyz")
+        P.add_relation("z", "xY")
+        P.add_relation("xxx", "x")
+        P.add_relation("yyy", "y")
+        P.add_relation("xy", "yx")
+
+        Q = SimplifiedPresentation(P)
+        self.assertEqual(Q.presn.alphabet, "xyXY")
+        self.assertEqual(Q.to_simplified("Z"), "yX")
+
+        S = SchutzenbergerGraph(P, "z", simplify=True)
+        self.assertTrue(S.accepts("xY"))
+        self.assertTrue(S.accepts("xYyY"))
+        self.assertFalse(S.accepts("x"))
+        self.assertEqual(
+            Stephen(P, simplify=True).size(), Stephen(Q.presn).size()
+        )
+
+    def test_004(self):
+        P = InverseMonoidPresentation()
+        P.set_alphabet("xyz")
+        P.add_relation("xxxxx", "x")
+        P.add_relation("yyyyy", "y")
+        P.add_relation("zzzzz", "z")
+        P.add_relation("xyy", "yxx")
+        P.add_relation("xzz", "zxx")
+        P.add_relation("yzz", "zyy")
+        P.add_relation("yzz", "zyy")
+        P.add_relation("xxxxxxxxx", "x")
+
+        S = Stephen(P, simplify=True)
+        self.assertEqual(S.size(), 173)
+        self.assertEqual(S.number_of_r_classes(), 8)
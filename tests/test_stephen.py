@@ -6,8 +6,22 @@
 #
 # The full license is in the file LICENSE, distributed with this software.
 
+import copy
+import pickle
 import unittest
 from step_hen import Stephen, InverseMonoidPresentation
+from step_hen.divergence import DivergenceMonitor
+
+
+class _RClassCounter(DivergenceMonitor):
+    # Records the number of R-classes found by Stephen after every step.
+    def __init__(self):
+        DivergenceMonitor.__init__(self)
+        self.sizes = [0]
+
+    def observe(self, size, shrunk, label):
+        self.sizes.append(size)
+        DivergenceMonitor.observe(self, size, shrunk, label)
 
 
 class TestStephen(unittest.TestCase):
@@ -99,3 +113,85 @@ class TestStephen(unittest.TestCase):
         S = Stephen(P)
         self.assertEqual(S.number_of_r_classes(), 8)
         self.assertEqual(S.size(), 34)
+
+    def test_007(self):
+        P = InverseMonoidPresentation()
+        P.set_alphabet(2)
+        P.add_relation([0, 0, 0], [0])
+        P.add_relation([1, 1, 1, 1, 1], [1])
+        P.add_relation([0, 1, 0, 1], [0, 0])
+
+        S = Stephen(P)
+        self.assertEqual(S.size(), 13)
+        self.assertEqual(S.number_of_r_classes(), 3)
+        self.assertEqual(Stephen(P, simplify=True).size(), 13)
+
+    def test_008(self):
+        P = InverseMonoidPresentation()
+        P.set_alphabet("xy")
+        P.add_relation("xxxxx", "x")
+        P.add_relation("yyyyy", "y")
+        P.add_relation("xyy", "yxx")
+
+        S = Stephen(P)
+        S.size()
+        S.add_relation("yxx", "xyy")
+        S.add_relation("xxx", "x")
+        S.add_relation("yyy", "y")
+
+        Q = InverseMonoidPresentation()
+        Q.set_alphabet("xy")
+        Q.add_relation("xxx", "x")
+        Q.add_relation("yyy", "y")
+        Q.add_relation("xyy", "yxx")
+        self.assertEqual(S.size(), Stephen(Q).size())
+        self.assertEqual(S.size(), 7)
+        self.assertEqual(S.number_of_r_classes(), 4)
+        self.assertEqual(len(P.relations), 3)
+
+    def test_009(self):
+        P = InverseMonoidPresentation()
+        P.set_alphabet("abc")
+        P.add_relation("aa", "a")
+        P.add_relation("bb", "b")
+        P.add_relation("cc", "c")
+        P.add_relation("ab", "ba")
+        P.add_relation("ac", "ca")
+        P.add_relation("bc", "cb")
+
+        S = Stephen(P, low_memory=True)
+        T = Stephen(P)
+        self.assertEqual(S.size(), T.size())
+        self.assertEqual(S.number_of_r_classes(), T.number_of_r_classes())
+        self.assertLess(len(pickle.dumps(S)), len(pickle.dumps(T)))
+        S.add_relation("a", "b")
+        self.assertEqual(S.size(), 4)
+
+    def test_010(self):
+        P = InverseMonoidPresentation()
+        P.set_alphabet("xyz")
+        P.add_relation("xxx", "x")
+        P.add_relation("yyy", "y")
+        P.add_relation("zzz", "z")
+        P.add_relation("xy", "yx")
+        P.add_relation("xz", "zx")
+        P.add_relation("yz", "zy")
+
+        counter = _RClassCounter()
+        S = Stephen(P, automorphisms=True, monitor=counter)
+        self.assertEqual(S.size(), 27)
+        self.assertEqual(S.number_of_r_classes(), 8)
+        self.assertEqual(max(counter.sizes), 4)
+
+        counter = _RClassCounter()
+        S = Stephen(P, automorphisms=[[1, 0, 2]], monitor=counter)
+        self.assertEqual(S.size(), 27)
+        self.assertEqual(max(counter.sizes), 6)
+        S.add_relation("xxy", "x")
+        Q = copy.deepcopy(P)
+        Q.add_relation("xxy", "x")
+        self.assertEqual(S.size(), Stephen(Q).size())
+        self.assertEqual(Stephen(P).size(), 27)
+
+        with self.assertRaises(ValueError):
+            Stephen(Q, automorphisms=[[1, 2, 0]])
@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2021, J. D. Mitchell + Maria Tsalakou
+#
+# Distributed under the terms of the GPL license version 3.
+#
+# The full license is in the file LICENSE, distributed with this software.
+
+import unittest
+from step_hen import MonoidPresentation, ToddCoxeter, WordGraph
+
+
+class TestToddCoxeter(unittest.TestCase):
+    def test_001(self):
+        P = MonoidPresentation()
+        P.set_alphabet("a")
+        P.add_relation("aa", "a")
+
+        T = ToddCoxeter(P)
+        self.assertEqual(T.size(), 2)
+        self.assertEqual(T.normal_forms(), ["", "a"])
+        self.assertEqual(T.multiplication_table(), [[0, 1], [1, 1]])
+        self.assertEqual(T.right_cayley_graph(), [[1], [1]])
+
+    def test_002(self):
+        P = MonoidPresentation()
+        P.set_alphabet("ab")
+        P.add_relation("aa", "")
+        P.add_relation("bbb", "")
+        P.add_relation("abab", "")
+
+        T = ToddCoxeter(P)
+        self.assertEqual(T.size(), 6)
+        self.assertEqual(T.element(""), 0)
+        self.assertEqual(T.element("ab"), T.element("bba"))
+        self.assertNotEqual(T.element("ab"), T.element("ba"))
+        table = T.multiplication_table()
+        self.assertTrue(all(sorted(row) == list(range(6)) for row in table))
+
+    def test_003(self):
+        P = MonoidPresentation()
+        P.set_alphabet("ab")
+        P.add_relation("aaa", "a")
+        P.add_relation("bbb", "b")
+        P.add_relation("abab", "aa")
+
+        T = ToddCoxeter(P)
+        words = T.normal_forms()
+        self.assertEqual(len(words), T.size())
+        self.assertEqual(len(set(words)), T.size())
+        for i, u in enumerate(words):
+            S = WordGraph(P, u)
+            for j, v in enumerate(words):
+                self.assertEqual(S.equal_to(v), i == j)
+        table = T.multiplication_table()
+        for i, u in enumerate(words):
+            for j, v in enumerate(words):
+                self.assertEqual(table[i][j], T.element(u + v))
+
+    def test_004(self):
+        P = MonoidPresentation()
+        P.set_alphabet("abc")
+        P.add_relation("ab", "ba")
+        P.add_relation("ac", "ca")
+        P.add_relation("bc", "cb")
+        P.add_relation("aa", "a")
+        P.add_relation("bb", "b")
+        P.add_relation("cc", "c")
+
+        self.assertEqual(ToddCoxeter(P).size(), 8)
+        self.assertEqual(ToddCoxeter(P, storage="mmap").size(), 8)
+
+    def test_005(self):
+        P = MonoidPresentation()
+        P.set_alphabet("ab")
+        P.add_relation("aa", "a")
+        P.add_relation("bb", "b")
+        P.add_relation("aba", "a")
+        P.add_relation("bab", "b")
+
+        T = ToddCoxeter(P)
+        self.assertEqual(T.size(), 5)
+        T.add_relation("ab", "ba")
+        self.assertEqual(T.size(), 2)
+        self.assertEqual(T.element("a"), T.element("b"))
+
+    def test_006(self):
+        P = MonoidPresentation()
+        P.set_alphabet("ab")
+        P.add_relation("aa", "")
+        P.add_relation("bbb", "")
+        P.add_relation("abab", "")
+
+        self.assertTrue(ToddCoxeter(P).equal_to("aa"))
+        self.assertFalse(ToddCoxeter(P).equal_to("ab"))
+        T = ToddCoxeter(P)
+        T.run(budget=1)
+        self.assertEqual(T.number_of_nodes(), 2)
+        T.run(until=lambda: T.number_of_nodes() >= 3)
+        self.assertEqual(T.number_of_nodes(), 4)
+        self.assertEqual(T.size(), 6)
+
+    def test_007(self):
+        P = MonoidPresentation()
+        P.set_alphabet(2)
+        P.add_relation([0], [1, 1])
+        P.add_relation([1, 1, 1], [1])
+
+        T = ToddCoxeter(P, simplify=True)
+        self.assertEqual(T.size(), 3)
+        self.assertEqual(
+            [T.element(w) for w in T.normal_forms()], [0, 1, 2]
+        )
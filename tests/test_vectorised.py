@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2021, J. D. Mitchell + Maria Tsalakou
+#
+# Distributed under the terms of the GPL license version 3.
+#
+# The full license is in the file LICENSE, distributed with this software.
+
+import unittest
+from step_hen import (
+    InverseMonoidPresentation,
+    MonoidPresentation,
+    SchutzenbergerGraph,
+    WordGraph,
+)
+from step_hen.vectorised import numpy, relation_sweep
+
+
+@unittest.skipIf(numpy is None, "NumPy is not installed")
+class TestVectorised(unittest.TestCase):
+    def test_001(self):
+        P = MonoidPresentation()
+        P.set_alphabet("ab")
+        P.add_relation("aa", "a")
+        P.add_relation("ab", "b")
+
+        S = WordGraph(P, "ab")
+        self.assertEqual(S.edges, [[1, None], [None, 2], [None, None]])
+        self.assertEqual(
+            relation_sweep(S.nodes, S.edges, P.relations),
+            [(0, 0), (0, 1), (1, 1)],
+        )
+
+    def test_002(self):
+        P = MonoidPresentation()
+        P.set_alphabet("ab")
+        P.add_relation("aaa", "a")
+        P.add_relation("bbb", "b")
+        P.add_relation("abab", "aa")
+
+        S = WordGraph(P, "bbab", vectorised=True)
+        self.assertTrue(S.equal_to("bbaaba"))
+        self.assertFalse(S.equal_to(""))
+        self.assertFalse(S.equal_to("bbb"))
+        self.assertEqual(relation_sweep(S.nodes, S.edges, P.relations), [])
+
+        T = WordGraph(P, "bbab", storage="mmap", vectorised=True)
+        self.assertTrue(T.equal_to("bbaaba"))
+        self.assertEqual(T.number_of_nodes(), S.number_of_nodes())
+
+    def test_003(self):
+        P = InverseMonoidPresentation()
+        P.set_alphabet("abc")
+        P.add_relation("ac", "ca")
+        P.add_relation("ab", "ba")
+        P.add_relation("bc", "cb")
+
+        w = "BaAbaBcAbC"
+        S = SchutzenbergerGraph(P, w, vectorised=True)
+        S.run()
+        self.assertEqual(S.number_of_nodes(), 7)
+        self.assertTrue(S.accepts("aBcCbBcAbC"))
+        self.assertFalse(S.accepts("BaAbaBcAbCc"))
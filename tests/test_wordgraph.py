@@ -90,3 +90,48 @@ class TestWordGraph(unittest.TestCase):
 
         S = WordGraph(P, "dabdaaadabab")
         self.assertTrue(S.equal_to("abdadcaca"))
+
+    def test_006(self):
+        P = MonoidPresentation()
+        P.set_alphabet("ab")
+        P.add_relation("ab", "ba")
+        P.add_relation("abb", "a")
+
+        S = WordGraph(P, "aab", incremental=True, budget=50)
+        self.assertTrue(S.equal_to("aba"))
+        self.assertTrue(S.equal_to("baa"))
+        self.assertIsNone(S.equal_to("a"))
+        T = WordGraph(P, "aab", budget=10)
+        self.assertIsNone(T.equal_to("a"))
+
+    def test_007(self):
+        P = MonoidPresentation()
+        P.set_alphabet("ab")
+        P.add_relation("aaa", "a")
+        P.add_relation("bbb", "b")
+
+        S = WordGraph(P, "bbab")
+        self.assertFalse(S.equal_to("bbaaba"))
+        S.add_relation("abab", "aa")
+        self.assertTrue(S.equal_to("bbaaba"))
+        self.assertFalse(S.equal_to("bbb"))
+        # The presentation given to S is not modified
+        self.assertEqual(len(P.relations), 2)
+        self.assertFalse(WordGraph(P, "bbab").equal_to("bbaaba"))
+
+    def test_008(self):
+        P = MonoidPresentation()
+        P.set_alphabet("ab")
+        P.add_relation("aa", "a")
+        P.add_relation("ab", "b")
+
+        S = WordGraph(P, "ab")
+        S.run()
+        self.assertEqual(S.canonical_form(), [[1, 2], [1, 2], [None, None]])
+        self.assertEqual(S.canonical_form(2), [[None, None]])
+        T = WordGraph(P, "b", storage="sparse")
+        self.assertNotEqual(S.fingerprint(), T.fingerprint())
+        T.run()
+        self.assertEqual(S.canonical_form(), T.canonical_form())
+        self.assertEqual(S.fingerprint(), T.fingerprint())
+        self.assertEqual(len(S.fingerprint()), 32)